@@ -0,0 +1,77 @@
+from iconservice import *
+
+CHUNK_SIZE = 1024
+
+
+class ChunkedDB(object):
+    """
+    Stores byte values split into CHUNK_SIZE pieces, one DB entry per piece,
+    along with the value length and its sha3_256 checksum.
+    Reads only touch the chunks they need.
+    """
+
+    def __init__(self, var_key: str, db: IconScoreDatabase) -> None:
+        self._chunks = DictDB(f'{var_key}_chunks', db, value_type=bytes, depth=2)
+        self._sizes = DictDB(f'{var_key}_sizes', db, value_type=int)
+        self._checksums = DictDB(f'{var_key}_checksums', db, value_type=bytes)
+
+    def put(self, key: str, value: bytes) -> None:
+        old_count = self.count(key)
+        count = self._count_of(len(value))
+
+        chunks = self._chunks[key]
+        for index in range(count):
+            chunks[index] = value[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE]
+        for index in range(count, old_count):
+            chunks.remove(index)
+
+        self._sizes[key] = len(value)
+        self._checksums[key] = sha3_256(value)
+
+    def remove(self, key: str) -> None:
+        chunks = self._chunks[key]
+        for index in range(self.count(key)):
+            chunks.remove(index)
+
+        self._sizes.remove(key)
+        self._checksums.remove(key)
+
+    def get(self, key: str) -> bytes:
+        chunks = self._chunks[key]
+        return b''.join(chunks[index] for index in range(self.count(key)))
+
+    def get_chunk(self, key: str, index: int) -> bytes:
+        if not 0 <= index < self.count(key):
+            revert(f'Chunk out of range: {index}')
+        return self._chunks[key][index]
+
+    def get_range(self, key: str, offset: int, length: int) -> bytes:
+        """Returns up to length bytes of the value starting at offset."""
+        if offset < 0 or length < 0:
+            revert(f'Invalid range: offset={offset} length={length}')
+
+        end = min(offset + length, self.size(key))
+        if offset >= end:
+            return b''
+
+        chunks = self._chunks[key]
+        first, last = offset // CHUNK_SIZE, (end - 1) // CHUNK_SIZE
+        data = b''.join(chunks[index] for index in range(first, last + 1))
+        start = offset - first * CHUNK_SIZE
+        return data[start:start + end - offset]
+
+    def size(self, key: str) -> int:
+        return self._sizes[key]
+
+    def count(self, key: str) -> int:
+        return self._count_of(self.size(key))
+
+    def checksum(self, key: str) -> bytes:
+        return self._checksums[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sizes
+
+    @staticmethod
+    def _count_of(size: int) -> int:
+        return (size + CHUNK_SIZE - 1) // CHUNK_SIZE
@@ -1,26 +1,126 @@
 from iconservice import *
 
+from .chunked_db import ChunkedDB, CHUNK_SIZE
+from .packed_array import PackedArrayDB
+
 TAG = 'Hello'
 
+STORAGE_VERSION = 4
+
+MAX_PAGE_SIZE = 100
+MAX_BATCH_SIZE = 100
+MAX_SCAN_SIZE = 1000
+# Values up to this many UTF-8 bytes are indexed as they are; larger ones by their sha3_256 hash
+MAX_INDEXED_SIZE = 256
+
+VAR_CHUNK_KEY = "var_db"
+
 
 class Hello(IconScoreBase):
 
     def __init__(self, db: IconScoreDatabase) -> None:
         super().__init__(db)
-        self._array_db = ArrayDB("array_db", db, value_type=str)
+        # Until storage version 3 the array was an ArrayDB under the same key, see migrateArray
+        self._array_db = PackedArrayDB("array_db", db, legacy_key="array_db")
         self._dict_db = DictDB("dict_db", db, value_type=str, depth=1)
         self._var_db = VarDB("var_db", db, value_type=str)
+        # Values written in chunked mode are kept here instead of _var_db/_dict_db
+        self._var_chunks = ChunkedDB("var", db)
+        self._dict_chunks = ChunkedDB("dict", db)
+        # History of _var_db (see _var_history_heights and _var_history_values):
+        # block heights in ascending order and the value set at each of them
+        # Values set in chunked mode are recorded by size and checksum, keyed by checkpoint index
+        self._var_history_sizes = DictDB("var_history_sizes", db, value_type=int)
+        self._var_history_checksums = DictDB("var_history_checksums", db, value_type=bytes)
+        self._storage_version = VarDB("storage_version", db, value_type=int)
+        # Array positions [0, left) that migrateArray has yet to migrate from the storage version before the update
+        self._migration_version = VarDB("migration_version", db, value_type=int)
+        self._migration_left = VarDB("migration_left", db, value_type=int)
+        # Value index of _array_db: every value maps its occurrences to array positions,
+        # and every position refers back to its occurrence of the value
+        self._array_value_counts = DictDB("array_value_counts", db, value_type=int)
+        self._array_value_positions = DictDB("array_value_positions", db, value_type=int, depth=2)
+        self._array_position_refs = DictDB("array_position_refs", db, value_type=int)
+        # The number of values with at least one occurrence in _array_db
+        self._array_distinct_count = VarDB("array_distinct_count", db, value_type=int)
+        # Key index of _dict_db: keys in insertion order (see _dict_keys) and their positions
+        self._dict_key_positions = DictDB("dict_key_positions", db, value_type=int)
 
     def on_install(self) -> None:
         super().on_install()
+        self._storage_version.set(STORAGE_VERSION)
 
     def on_update(self) -> None:
         super().on_update()
+        self._migrate(self._storage_version.get())
+        self._storage_version.set(STORAGE_VERSION)
 
-    @eventlog()
+    def _migrate(self, version: int) -> None:
+        if version < 2:
+            # The history starts at the update; earlier values were not recorded
+            if self._var_db.get() != "":
+                self._record_var_history(self._var_db.get())
+        if version < 3:
+            # Until version 3 the array was kept one item per entry. The items are read in place until migrated
+            self._array_db.adopt_legacy()
+        if version < 4 and len(self._array_db) > 0:
+            # Packing the items, indexing them and counting the distinct values visit every item,
+            # so they are left to migrateArray to keep the cost of an update constant
+            self._migration_version.set(version)
+            self._migration_left.set(len(self._array_db))
+
+    @eventlog(indexed=1)
     def SetVar(self, value: str):
         pass
 
+    @eventlog(indexed=1)
+    def SetVarHashed(self, valueHash: bytes, value: str):
+        pass
+
+    @eventlog(indexed=1)
+    def SetVarChunked(self, valueHash: bytes, size: int, chunks: int):
+        pass
+
+    @eventlog(indexed=1)
+    def AppendArray(self, data: str):
+        pass
+
+    @eventlog(indexed=1)
+    def AppendArrayHashed(self, dataHash: bytes, data: str):
+        pass
+
+    @eventlog()
+    def AppendArrayBatch(self, count: int):
+        pass
+
+    @eventlog(indexed=1)
+    def RemoveArray(self, data: str):
+        pass
+
+    @eventlog(indexed=1)
+    def RemoveArrayHashed(self, dataHash: bytes, data: str):
+        pass
+
+    @eventlog()
+    def MigrateArray(self, count: int, left: int):
+        pass
+
+    @eventlog(indexed=2)
+    def SetDict(self, key: str, value: str):
+        pass
+
+    @eventlog(indexed=2)
+    def SetDictHashed(self, keyHash: bytes, valueHash: bytes, key: str, value: str):
+        pass
+
+    @eventlog(indexed=2)
+    def SetDictChunked(self, keyHash: bytes, valueHash: bytes, key: str, size: int, chunks: int):
+        pass
+
+    @eventlog()
+    def SetDictBatch(self, count: int):
+        pass
+
     @external(readonly=True)
     def hello(self) -> str:
         Logger.debug(f'Hello, world!', TAG)
@@ -28,25 +128,509 @@ class Hello(IconScoreBase):
 
     @external(readonly=True)
     def getArray(self) -> list:
-        return [d for d in self._array_db]
+        return self._array_db.get_range(0, len(self._array_db))
+
+    @external(readonly=True)
+    def getArrayLength(self) -> int:
+        return len(self._array_db)
+
+    @external(readonly=True)
+    def getArrayRange(self, offset: int = 0, limit: int = MAX_PAGE_SIZE) -> list:
+        if offset < 0:
+            revert(f'Invalid offset: {offset}')
+        self._check_page_size(limit)
+
+        return self._array_db.get_range(offset, offset + limit)
+
+    @external(readonly=True)
+    def getArrayLatest(self, count: int = MAX_PAGE_SIZE) -> list:
+        self._check_page_size(count)
+
+        size = len(self._array_db)
+        items = self._array_db.get_range(max(size - count, 0), size)
+        items.reverse()
+        return items
 
     @external
     def appendArray(self, data: str):
-        self._array_db.put(data)
+        self._append_array(data)
+        self._log_append_array(data)
+
+    @external
+    def appendArrayBatch(self, data: str, summary: bool = False):
+        """Appends the items of a JSON array of strings in order.
+
+        :param data: JSON array of strings, e.g. '["a","b"]'
+        :param summary: emit one AppendArrayBatch log instead of an AppendArray log per item
+        """
+        items = self._load_batch(data, list)
+        for item in items:
+            if not isinstance(item, str):
+                revert(f'Invalid item type: {type(item).__name__}')
+
+        position = len(self._array_db)
+        for offset, item in enumerate(items):
+            self._index_array_value(item, position + offset)
+        self._array_db.extend(items)
+
+        if not summary:
+            for item in items:
+                self._log_append_array(item)
+
+        if summary:
+            self.AppendArrayBatch(len(items))
+
+    @external(readonly=True)
+    def containsArray(self, data: str) -> bool:
+        # The value index is kept since storage version 1
+        self._check_migrated(1)
+        return self._array_value_counts[data] > 0
+
+    @external(readonly=True)
+    def indexOfArray(self, data: str) -> int:
+        """Returns a position of data in the array, or -1 if it is absent.
+
+        If data occurs more than once, the position of any one occurrence is returned.
+        """
+        self._check_migrated(1)
+        count = self._array_value_counts[data]
+        if count == 0:
+            return -1
+        return self._array_value_positions[data][count - 1]
+
+    @external(readonly=True)
+    def countArray(self, data: str) -> int:
+        """Returns the number of occurrences of data in the array."""
+        self._check_migrated(1)
+        return self._array_value_counts[data]
+
+    @external(readonly=True)
+    def getArrayStats(self) -> dict:
+        """Returns the number of items and of distinct values in the array."""
+        # The distinct count is kept since storage version 4
+        self._check_migrated(4)
+        return {"length": len(self._array_db), "distinct": self._array_distinct_count.get()}
+
+    @external
+    def removeArray(self, data: str):
+        """Removes one occurrence of data by moving the last item into its position.
+
+        The order of the remaining items is not preserved.
+        """
+        # Moving an item could move it into or out of the positions left to migrate
+        self._check_migrated(STORAGE_VERSION)
+        count = self._array_value_counts[data]
+        if count == 0:
+            revert(f'Value not found: {data}')
+
+        position = self._unindex_array_value(data, count - 1)
+        last_position = len(self._array_db) - 1
+        if position != last_position:
+            last_data = self._array_db[last_position]
+            occurrence = self._array_position_refs[last_position]
+            self._array_db[position] = last_data
+            self._array_value_positions[last_data][occurrence] = position
+            self._array_position_refs[position] = occurrence
+
+        self._array_db.pop()
+        self._array_position_refs.remove(last_position)
+        if self._is_indexable(data):
+            self.RemoveArray(data)
+        else:
+            self.RemoveArrayHashed(sha3_256(data.encode()), data)
+
+    @external
+    def migrateArray(self, count: int = MAX_SCAN_SIZE):
+        """Migrates at least count of the array items left by on_update, a bucket of items at a time from the end.
+
+        Until none is left, the array can be read and appended to, while removeArray
+        and the queries that need the value index or the distinct count revert.
+
+        :param count: 1 ~ MAX_SCAN_SIZE
+        """
+        if not 0 < count <= MAX_SCAN_SIZE:
+            revert(f'Invalid count: {count} (1 ~ {MAX_SCAN_SIZE})')
+        left = self._migration_left.get()
+        if left == 0:
+            revert('Nothing to migrate')
+
+        version = self._migration_version.get()
+        start, end = left, max(left - count, 0)
+        while left > end:
+            first = end
+            if version < 3:
+                # The legacy items move a bucket at a time, which may go past end
+                items = self._array_db.pack_legacy()
+                first = left - len(items)
+            if version < 1:
+                for offset, data in enumerate(items):
+                    self._index_array_value(data, first + offset)
+            else:
+                # Every value has one position that refers to its occurrence 0
+                refs = [self._array_position_refs[position] for position in range(first, left)]
+                self._array_distinct_count.set(self._array_distinct_count.get() + refs.count(0))
+            left = first
+
+        if left == 0:
+            self._migration_version.remove()
+            self._migration_left.remove()
+        else:
+            self._migration_left.set(left)
+        self.MigrateArray(start - left, left)
+
+    @external(readonly=True)
+    def getArrayMigrationLeft(self) -> int:
+        """Returns the number of array items that migrateArray has yet to migrate."""
+        return self._migration_left.get()
 
     @external(readonly=True)
     def getVar(self) -> str:
-        return self._var_db.get()
+        value = self._var_db.get()
+        if value == "" and VAR_CHUNK_KEY in self._var_chunks:
+            return self._var_chunks.get(VAR_CHUNK_KEY).decode()
+        return value
 
     @external
-    def setVar(self, data: str):
-        self._var_db.set(data)
-        self.SetVar(data)
+    def setVar(self, data: str, chunked: bool = False):
+        """Sets the var.
+
+        :param data: value
+        :param chunked: store the value in CHUNK_SIZE byte pieces readable with getVarChunk/getVarRange
+        """
+        if chunked:
+            self._var_chunks.put(VAR_CHUNK_KEY, data.encode())
+            self._var_db.remove()
+            size = self._var_chunks.size(VAR_CHUNK_KEY)
+            checksum = self._var_chunks.checksum(VAR_CHUNK_KEY)
+            self._record_var_history("", size, checksum)
+            # Only the hash and size of a chunked value are logged, as for the history
+            self.SetVarChunked(checksum, size, self._var_chunks.count(VAR_CHUNK_KEY))
+        else:
+            if VAR_CHUNK_KEY in self._var_chunks:
+                self._var_chunks.remove(VAR_CHUNK_KEY)
+            self._var_db.set(data)
+            self._record_var_history(data)
+            if self._is_indexable(data):
+                self.SetVar(data)
+            else:
+                self.SetVarHashed(sha3_256(data.encode()), data)
+
+    @external(readonly=True)
+    def getVarInfo(self) -> dict:
+        return self._get_chunk_info(self._var_chunks, VAR_CHUNK_KEY)
+
+    @external(readonly=True)
+    def getVarChunk(self, index: int) -> bytes:
+        self._check_chunked(self._var_chunks, VAR_CHUNK_KEY)
+        return self._var_chunks.get_chunk(VAR_CHUNK_KEY, index)
+
+    @external(readonly=True)
+    def getVarRange(self, offset: int, length: int) -> bytes:
+        """Returns up to length bytes of the UTF-8 encoded var starting at offset."""
+        self._check_chunked(self._var_chunks, VAR_CHUNK_KEY)
+        return self._var_chunks.get_range(VAR_CHUNK_KEY, offset, length)
+
+    @external(readonly=True)
+    def getVarAt(self, height: int) -> str:
+        """Returns the value of the var as of the end of the block at height.
+
+        The history keeps only the size and checksum of a value set in chunked mode,
+        so it reverts for such a value; see getVarInfoAt.
+        """
+        index = self._find_var_checkpoint(height)
+        if index < 0:
+            return ""
+        if index in self._var_history_checksums:
+            revert(f'Chunked value at {height}: see getVarInfoAt')
+        return self._var_history_values()[index]
+
+    @external(readonly=True)
+    def getVarInfoAt(self, height: int) -> dict:
+        """Returns whether the var was chunked as of the end of the block at height, with its size and checksum.
+
+        A chunked value can be read with getVarChunk/getVarRange while getVarInfo has the same checksum.
+        """
+        index = self._find_var_checkpoint(height)
+        if index >= 0 and index in self._var_history_checksums:
+            return {
+                "chunked": True,
+                "size": self._var_history_sizes[index],
+                "checksum": self._var_history_checksums[index]
+            }
+
+        value = self._var_history_values()[index].encode() if index >= 0 else b""
+        return {"chunked": False, "size": len(value), "checksum": sha3_256(value)}
 
     @external(readonly=True)
     def getDict(self, key: str) -> str:
-        return self._dict_db[key]
+        value = self._get_dict(key)
+        return "" if value is None else value
+
+    @external(readonly=True)
+    def getDictMany(self, keys: str) -> dict:
+        """Looks up several keys at once.
+
+        :param keys: JSON array of keys, e.g. '["a","b"]'
+        :return: {"values": {key: value}, "missing": [key]}
+        """
+        keys = self._load_batch(keys, list)
+
+        values = {}
+        missing = []
+        for key in keys:
+            if not isinstance(key, str):
+                revert(f'Invalid key type: {type(key).__name__}')
+
+            value = self._get_dict(key)
+            if value is None:
+                missing.append(key)
+            else:
+                values[key] = value
+
+        return {"values": values, "missing": missing}
+
+    @external(readonly=True)
+    def getDictKeys(self, offset: int = 0, limit: int = MAX_PAGE_SIZE) -> list:
+        """Returns the keys of the key index in the order they were first set; see getDictSize."""
+        if offset < 0:
+            revert(f'Invalid offset: {offset}')
+        self._check_page_size(limit)
+
+        dict_keys = self._dict_keys()
+        end = min(offset + limit, len(dict_keys))
+        return [dict_keys[index] for index in range(offset, end)]
+
+    @external(readonly=True)
+    def getDictKeysWithPrefix(self, prefix: str, offset: int = 0, limit: int = MAX_PAGE_SIZE) -> dict:
+        """Scans the key index from offset for keys starting with prefix.
+
+        At most MAX_SCAN_SIZE index entries are examined per call. Pass the returned
+        "next" as offset to continue the scan; it is -1 when the index is exhausted.
+
+        :return: {"keys": [key], "next": offset}
+        """
+        if offset < 0:
+            revert(f'Invalid offset: {offset}')
+        self._check_page_size(limit)
+
+        dict_keys = self._dict_keys()
+        size = len(dict_keys)
+        end = min(offset + MAX_SCAN_SIZE, size)
+        keys = []
+        index = offset
+        while index < end and len(keys) < limit:
+            key = dict_keys[index]
+            if key.startswith(prefix):
+                keys.append(key)
+            index += 1
+
+        return {"keys": keys, "next": index if index < size else -1}
+
+    @external(readonly=True)
+    def getDictSize(self) -> int:
+        """Returns the number of keys in the key index.
+
+        A key set before the index was kept (hello_v0, storage version 0) is neither counted
+        nor listed by getDictKeys until it is set again, since a DictDB cannot be enumerated.
+        """
+        return len(self._dict_keys())
+
+    @external(readonly=True)
+    def getDictInfo(self, key: str) -> dict:
+        return self._get_chunk_info(self._dict_chunks, key)
+
+    @external(readonly=True)
+    def getDictChunk(self, key: str, index: int) -> bytes:
+        self._check_chunked(self._dict_chunks, key)
+        return self._dict_chunks.get_chunk(key, index)
+
+    @external(readonly=True)
+    def getDictRange(self, key: str, offset: int, length: int) -> bytes:
+        """Returns up to length bytes of the UTF-8 encoded value starting at offset."""
+        self._check_chunked(self._dict_chunks, key)
+        return self._dict_chunks.get_range(key, offset, length)
 
     @external
-    def setDict(self, key: str, value: str):
-        self._dict_db[key] = value
+    def setDict(self, key: str, value: str, chunked: bool = False):
+        """Sets the value of key.
+
+        :param key: key
+        :param value: value
+        :param chunked: store the value in CHUNK_SIZE byte pieces readable with getDictChunk/getDictRange
+        """
+        self._set_dict(key, value, chunked)
+        self._log_set_dict(key, value, chunked)
+
+    @external
+    def setDictBatch(self, entries: str, summary: bool = False):
+        """Sets every key of a JSON object of strings.
+
+        :param entries: JSON object of string values, e.g. '{"a":"1","b":"2"}'
+        :param summary: emit one SetDictBatch log instead of a SetDict log per entry
+        """
+        entries = self._load_batch(entries, dict)
+        for value in entries.values():
+            if not isinstance(value, str):
+                revert(f'Invalid value type: {type(value).__name__}')
+
+        for key, value in entries.items():
+            self._set_dict(key, value)
+            if not summary:
+                self._log_set_dict(key, value)
+
+        if summary:
+            self.SetDictBatch(len(entries))
+
+    def _record_var_history(self, data: str, chunked_size: int = 0, chunked_checksum: bytes = None) -> None:
+        """Records data at the current block, or only the size and checksum of a value set in chunked mode."""
+        heights = self._var_history_heights()
+        values = self._var_history_values()
+        size = len(heights)
+        if size > 0 and heights[size - 1] == self.block_height:
+            index = size - 1
+            values[index] = data
+        else:
+            index = size
+            heights.put(self.block_height)
+            values.put(data)
+
+        if chunked_checksum is not None:
+            self._var_history_sizes[index] = chunked_size
+            self._var_history_checksums[index] = chunked_checksum
+        elif index in self._var_history_checksums:
+            self._var_history_sizes.remove(index)
+            self._var_history_checksums.remove(index)
+
+    def _find_var_checkpoint(self, height: int) -> int:
+        """Returns the index of the last checkpoint at or below height, or -1 if there is none."""
+        heights = self._var_history_heights()
+        low, high = 0, len(heights)
+        while low < high:
+            middle = (low + high) // 2
+            if heights[middle] <= height:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1
+
+    def _log_append_array(self, data: str) -> None:
+        if self._is_indexable(data):
+            self.AppendArray(data)
+        else:
+            self.AppendArrayHashed(sha3_256(data.encode()), data)
+
+    def _log_set_dict(self, key: str, value: str, chunked: bool = False) -> None:
+        if chunked:
+            # Only the hash and size of a chunked value are logged
+            self.SetDictChunked(sha3_256(key.encode()), self._dict_chunks.checksum(key), key,
+                                self._dict_chunks.size(key), self._dict_chunks.count(key))
+        # Both topics are hashed if either is too large, so a log has either the values or their hashes
+        elif self._is_indexable(key) and self._is_indexable(value):
+            self.SetDict(key, value)
+        else:
+            self.SetDictHashed(sha3_256(key.encode()), sha3_256(value.encode()), key, value)
+
+    def _open_array(self, var_key: str, value_type: type) -> ArrayDB:
+        # Below Revision.THREE an ArrayDB reads its size once and keeps it in the instance. The SCORE instance
+        # outlives a removed precommit state, so each use opens the array again to read the stored size.
+        return ArrayDB(var_key, self.db, value_type=value_type)
+
+    def _var_history_heights(self) -> ArrayDB:
+        return self._open_array("var_history_heights", int)
+
+    def _var_history_values(self) -> ArrayDB:
+        return self._open_array("var_history_values", str)
+
+    def _dict_keys(self) -> ArrayDB:
+        return self._open_array("dict_keys", str)
+
+    def _check_migrated(self, version: int) -> None:
+        """Reverts if array items migrated from a storage version before version are left."""
+        left = self._migration_left.get()
+        if left > 0 and self._migration_version.get() < version:
+            revert(f'Array migration pending: {left} items left, see migrateArray')
+
+    def _append_array(self, data: str) -> None:
+        self._index_array_value(data, len(self._array_db))
+        self._array_db.put(data)
+
+    def _index_array_value(self, data: str, position: int) -> None:
+        occurrence = self._array_value_counts[data]
+        self._array_value_positions[data][occurrence] = position
+        self._array_position_refs[position] = occurrence
+        self._array_value_counts[data] = occurrence + 1
+        if occurrence == 0:
+            self._array_distinct_count.set(self._array_distinct_count.get() + 1)
+
+    def _unindex_array_value(self, data: str, occurrence: int) -> int:
+        positions = self._array_value_positions[data]
+        position = positions[occurrence]
+        positions.remove(occurrence)
+        if occurrence == 0:
+            self._array_value_counts.remove(data)
+            self._array_distinct_count.set(self._array_distinct_count.get() - 1)
+        else:
+            self._array_value_counts[data] = occurrence
+        return position
+
+    def _get_dict(self, key: str):
+        """Returns the value of key, or None if it has never been set."""
+        value = self._dict_db[key]
+        # DictDB returns "" for an absent key, so only an empty value needs more reads
+        if value == "":
+            if key in self._dict_chunks:
+                return self._dict_chunks.get(key).decode()
+            if key not in self._dict_db:
+                return None
+        return value
+
+    def _set_dict(self, key: str, value: str, chunked: bool = False) -> None:
+        if key not in self._dict_key_positions:
+            dict_keys = self._dict_keys()
+            self._dict_key_positions[key] = len(dict_keys)
+            dict_keys.put(key)
+
+        if chunked:
+            self._dict_chunks.put(key, value.encode())
+            self._dict_db.remove(key)
+        else:
+            if key in self._dict_chunks:
+                self._dict_chunks.remove(key)
+            self._dict_db[key] = value
+
+    @staticmethod
+    def _is_indexable(value: str) -> bool:
+        return len(value.encode()) <= MAX_INDEXED_SIZE
+
+    @staticmethod
+    def _get_chunk_info(chunks: ChunkedDB, key: str) -> dict:
+        Hello._check_chunked(chunks, key)
+        return {
+            "size": chunks.size(key),
+            "chunkSize": CHUNK_SIZE,
+            "chunks": chunks.count(key),
+            "checksum": chunks.checksum(key)
+        }
+
+    @staticmethod
+    def _check_chunked(chunks: ChunkedDB, key: str) -> None:
+        if key not in chunks:
+            revert(f'Not a chunked value: {key}')
+
+    @staticmethod
+    def _load_batch(data: str, batch_type: type):
+        try:
+            batch = json_loads(data)
+        except ValueError:
+            revert('Invalid JSON')
+
+        if not isinstance(batch, batch_type):
+            revert(f'Invalid batch type: {type(batch).__name__} (expected {batch_type.__name__})')
+        if len(batch) > MAX_BATCH_SIZE:
+            revert(f'Too many items: {len(batch)} (max {MAX_BATCH_SIZE})')
+        return batch
+
+    @staticmethod
+    def _check_page_size(size: int) -> None:
+        if not 0 < size <= MAX_PAGE_SIZE:
+            revert(f'Invalid page size: {size} (1 ~ {MAX_PAGE_SIZE})')
@@ -0,0 +1,168 @@
+from iconservice import *
+
+BUCKET_SIZE = 16
+# Items of more UTF-8 bytes are stored in an entry of their own and left as null in their bucket
+MAX_INLINE_SIZE = 256
+
+
+class PackedArrayDB(object):
+    """
+    Stores str items in buckets of BUCKET_SIZE items, one DB entry per bucket
+    as a JSON array, along with the number of items.
+    Reading consecutive items touches one entry per bucket.
+    Items over MAX_INLINE_SIZE bytes are kept out of their bucket, so rewriting
+    a bucket does not rewrite them.
+    With legacy_key, the first items can be those of an ArrayDB, read in place
+    until pack_legacy() moves them into buckets.
+    """
+
+    def __init__(self, var_key: str, db: IconScoreDatabase, legacy_key: str = None) -> None:
+        self._db = db
+        self._buckets = DictDB(f'{var_key}_buckets', db, value_type=str)
+        # Items over MAX_INLINE_SIZE bytes by their index in the array
+        self._items = DictDB(f'{var_key}_items', db, value_type=str)
+        self._length = VarDB(f'{var_key}_length', db, value_type=int)
+        self._legacy_key = legacy_key
+
+    def __len__(self) -> int:
+        return self._length.get()
+
+    def __getitem__(self, index: int) -> str:
+        index = self._check_index(index)
+        return self._resolve(index, self._get_bucket(index // BUCKET_SIZE)[index % BUCKET_SIZE])
+
+    def __setitem__(self, index: int, value: str) -> None:
+        index = self._check_index(index)
+        bucket_index, offset = divmod(index, BUCKET_SIZE)
+        bucket = self._get_bucket(bucket_index)
+        if bucket[offset] is None and self._is_inline(value):
+            self._items.remove(index)
+        bucket[offset] = value
+        self._put_bucket(bucket_index, bucket)
+
+    def __iter__(self):
+        for bucket_index in range(self._count_of(len(self))):
+            first = bucket_index * BUCKET_SIZE
+            for offset, value in enumerate(self._get_bucket(bucket_index)):
+                yield self._resolve(first + offset, value)
+
+    def put(self, value: str) -> None:
+        self.extend([value])
+
+    def extend(self, values: list) -> None:
+        """Appends values in order, writing each bucket they fall into once."""
+        length = len(self)
+        index = 0
+        while index < len(values):
+            bucket_index, offset = divmod(length + index, BUCKET_SIZE)
+            bucket = self._get_bucket(bucket_index) if offset > 0 else []
+            count = min(BUCKET_SIZE - offset, len(values) - index)
+            bucket.extend(values[index:index + count])
+            self._put_bucket(bucket_index, bucket)
+            index += count
+
+        self._length.set(length + len(values))
+
+    def pop(self) -> str:
+        length = len(self)
+        if length == 0:
+            revert('Array is empty')
+
+        bucket_index = (length - 1) // BUCKET_SIZE
+        bucket = self._get_bucket(bucket_index)
+        value = bucket.pop()
+        if value is None:
+            value = self._items[length - 1]
+            self._items.remove(length - 1)
+        if bucket:
+            self._put_bucket(bucket_index, bucket)
+        else:
+            self._buckets.remove(bucket_index)
+
+        self._length.set(length - 1)
+        return value
+
+    def adopt_legacy(self) -> None:
+        """Makes the items of the legacy ArrayDB the items of this empty array without moving them."""
+        self._length.set(len(self._open_legacy()))
+
+    def pack_legacy(self) -> list:
+        """Moves the items of the last bucket still in the legacy ArrayDB into that bucket.
+
+        :return: the items moved, which are deleted from the legacy ArrayDB
+        """
+        legacy = self._open_legacy()
+        size = len(legacy)
+        if size == 0:
+            revert('No legacy items')
+
+        bucket_index = (size - 1) // BUCKET_SIZE
+        items = [legacy[index] for index in range(bucket_index * BUCKET_SIZE, size)]
+        # An append may have written the bucket, legacy items included, already
+        if not self._buckets[bucket_index]:
+            self._put_bucket(bucket_index, list(items))
+        for _ in items:
+            legacy.pop()
+        return items
+
+    def get_range(self, start: int, end: int) -> list:
+        """Returns the items from start up to, not including, end."""
+        end = min(end, len(self))
+        if start >= end:
+            return []
+
+        first, last = start // BUCKET_SIZE, (end - 1) // BUCKET_SIZE
+        values = []
+        for bucket_index in range(first, last + 1):
+            values.extend(self._get_bucket(bucket_index))
+        offset = first * BUCKET_SIZE
+        return [self._resolve(index, values[index - offset]) for index in range(start, end)]
+
+    def _check_index(self, index: int) -> int:
+        length = len(self)
+        # Negative index means that you count from the right instead of the left.
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            revert(f'Index out of range: {index}')
+        return index
+
+    def _resolve(self, index: int, value: str) -> str:
+        # None stands for an item kept out of its bucket
+        return self._items[index] if value is None else value
+
+    def _get_bucket(self, bucket_index: int) -> list:
+        """Returns the items of a bucket, with None for the items kept out of it.
+
+        A bucket not written since adopt_legacy() is read from the legacy ArrayDB.
+        """
+        data = self._buckets[bucket_index]
+        if data:
+            return json_loads(data)
+        if self._legacy_key is None:
+            return []
+
+        legacy = self._open_legacy()
+        first = bucket_index * BUCKET_SIZE
+        return [legacy[index] for index in range(first, min(first + BUCKET_SIZE, len(legacy)))]
+
+    def _put_bucket(self, bucket_index: int, bucket: list) -> None:
+        first = bucket_index * BUCKET_SIZE
+        for offset, value in enumerate(bucket):
+            # Large items are moved out, including those of buckets written before items were kept out
+            if value is not None and not self._is_inline(value):
+                self._items[first + offset] = value
+                bucket[offset] = None
+        self._buckets[bucket_index] = json_dumps(bucket)
+
+    def _open_legacy(self) -> ArrayDB:
+        # Below Revision.THREE an ArrayDB keeps the size it read at creation, so it is opened for each use
+        return ArrayDB(self._legacy_key, self._db, value_type=str)
+
+    @staticmethod
+    def _is_inline(value: str) -> bool:
+        return len(value.encode()) <= MAX_INLINE_SIZE
+
+    @staticmethod
+    def _count_of(length: int) -> int:
+        return (length + BUCKET_SIZE - 1) // BUCKET_SIZE
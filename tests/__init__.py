@@ -9,7 +9,7 @@
 
 import os
 
-from shutil import rmtree
+from shutil import rmtree, copytree, copy2
 from time import time
 
 import hashlib
@@ -33,6 +33,25 @@ def root_clear(score_path: str, state_db_path: str):
     rmtree(state_db_path, ignore_errors=True)
 
 
+def copy_dir(src_path: str, dst_path: str):
+    """Replaces dst_path with a copy of src_path, hard-linking LevelDB table files"""
+    rmtree(dst_path, ignore_errors=True)
+    if os.path.exists(src_path):
+        copytree(src_path, dst_path, copy_function=_link_or_copy)
+
+
+def _link_or_copy(src_path: str, dst_path: str):
+    # LevelDB never modifies a table file once it is written, so copies can share them.
+    # Logs, manifests and the other files are appended or rewritten and must be copied.
+    if src_path.endswith(('.ldb', '.sst')):
+        try:
+            os.link(src_path, dst_path)
+            return dst_path
+        except OSError:
+            pass
+    return copy2(src_path, dst_path)
+
+
 def create_timestamp():
     return int(time() * 10 ** 6)
 
@@ -0,0 +1,96 @@
+import json
+import math
+import os
+import platform
+
+from importlib.metadata import version, PackageNotFoundError
+from typing import Dict, Optional
+
+from tests import TEST_ROOT_PATH
+
+DEFAULT_REPORT_PATH = os.path.join(TEST_ROOT_PATH, 'bench_output.txt')
+
+
+def percentile(values: list, q: float) -> float:
+    """Returns the q-th percentile (0 ~ 100) of values with linear interpolation"""
+    if not values:
+        raise ValueError("No values")
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def get_environment() -> dict:
+    try:
+        iconservice_version = version('iconservice')
+    except PackageNotFoundError:
+        iconservice_version = 'unknown'
+
+    return {
+        'python': platform.python_version(),
+        'iconservice': iconservice_version,
+        'machine': platform.machine()
+    }
+
+
+class BenchmarkReport:
+    """Class for collecting benchmark results and comparing them with a baseline report."""
+
+    def __init__(self):
+        self._results: Dict[str, dict] = {}
+
+    @property
+    def results(self) -> Dict[str, dict]:
+        return self._results
+
+    def add(self, name: str, value: float, unit: str, higher_is_better: bool, **details):
+        """Records a result
+
+        :param name: unique name of the measurement. e.g. 'tps.setVar.block_10'
+        :param value: measured value
+        :param unit: unit of value. e.g. 'tx/s', 'ms'
+        :param higher_is_better: True for throughput, False for latency or cost
+        :param details: additional values written to the report as they are
+        """
+        self._results[name] = {
+            'value': value,
+            'unit': unit,
+            'higher_is_better': higher_is_better,
+            **details
+        }
+
+    def write(self, path: str = DEFAULT_REPORT_PATH):
+        with open(path, 'w') as f:
+            json.dump({'environment': get_environment(), 'results': self._results}, f, indent=2, sort_keys=True)
+
+    def compare(self, baseline_path: Optional[str], tolerance: float, names: list = None) -> list:
+        """Compares the results with those of a baseline report
+
+        :param baseline_path: path of a report written by write(). nothing is compared if None
+        :param tolerance: allowed relative degradation. e.g. 0.2 for 20%
+        :param names: names of the results to compare. all results if None
+        :return: descriptions of the results degraded more than tolerance
+        """
+        if baseline_path is None:
+            return []
+
+        with open(baseline_path) as f:
+            baseline = json.load(f)['results']
+
+        regressions = []
+        for name, result in self._results.items():
+            if names is not None and name not in names:
+                continue
+            if name not in baseline or baseline[name]['value'] == 0:
+                continue
+
+            change = (result['value'] - baseline[name]['value']) / baseline[name]['value']
+            if result['higher_is_better']:
+                change = -change
+            if change > tolerance:
+                regressions.append(f"{name}: {baseline[name]['value']:.3f} -> {result['value']:.3f} "
+                                   f"{result['unit']} ({change:+.1%} worse)")
+        return regressions
@@ -0,0 +1,181 @@
+"""Records the blocks invoked by TestIntegrateBase and replays them on a fresh state
+
+usage: python -m tests.block_stream PATH [-o REPORT]
+"""
+import argparse
+import gzip
+import json
+import pickle
+import sys
+
+from time import perf_counter
+from typing import Iterator, List, Optional
+
+from iconservice.base.block import Block
+
+from tests.benchmark import percentile
+
+FORMAT_VERSION = 1
+
+INVOKE = 'invoke'
+COMMIT = 'commit'
+REMOVE_PRECOMMIT = 'remove_precommit'
+
+
+class BlockStream:
+    """Class for keeping the blocks passed to IconServiceEngine with their commits and removed precommit states.
+
+    Records are pickled when they are added, so later changes to the requests do not affect them.
+    The file written by write() is a gzip of the pickled header followed by the pickled records.
+    """
+
+    def __init__(self, admin: 'Address', records: List[bytes] = None):
+        """
+        :param admin: the builtin SCORE owner the engine has to be opened with to replay the stream
+        :param records: pickled records to start with
+        """
+        self.admin = admin
+        self._records: List[bytes] = [] if records is None else list(records)
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def records(self) -> List[bytes]:
+        return list(self._records)
+
+    def add_invoke(self, block: 'Block', tx_requests: list, state_root_hash: bytes):
+        tx_requests = [self._materialize_genesis(tx) for tx in tx_requests]
+        self._add((INVOKE, self._pack_block(block), tx_requests, state_root_hash))
+
+    def add_commit(self, block: 'Block'):
+        self._add((COMMIT, block.height, block.hash))
+
+    def add_remove_precommit(self, block: 'Block'):
+        self._add((REMOVE_PRECOMMIT, block.height, block.hash))
+
+    def __iter__(self) -> Iterator[tuple]:
+        for record in self._records:
+            yield pickle.loads(record)
+
+    def write(self, path: str):
+        with gzip.open(path, 'wb') as f:
+            pickle.dump({'version': FORMAT_VERSION, 'admin': self.admin}, f, pickle.HIGHEST_PROTOCOL)
+            for record in self._records:
+                f.write(record)
+
+    @classmethod
+    def read(cls, path: str) -> 'BlockStream':
+        records = []
+        with gzip.open(path, 'rb') as f:
+            header = pickle.load(f)
+            if header.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported block stream version: {header.get('version')}")
+            while True:
+                try:
+                    records.append(pickle.dumps(pickle.load(f), pickle.HIGHEST_PROTOCOL))
+                except EOFError:
+                    break
+        return cls(header['admin'], records)
+
+    def _add(self, record: tuple):
+        self._records.append(pickle.dumps(record, pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _pack_block(block: 'Block') -> tuple:
+        return block.height, block.hash, block.timestamp, block.prev_hash, block.cumulative_fee
+
+    @staticmethod
+    def _materialize_genesis(tx: dict) -> dict:
+        # The genesis accounts may be streamed from their source and are stored as a list
+        if 'genesisData' not in tx:
+            return tx
+        return {**tx, 'genesisData': {**tx['genesisData'], 'accounts': list(tx['genesisData']['accounts'])}}
+
+
+def replay_block_stream(engine: 'IconServiceEngine', stream: 'BlockStream') -> dict:
+    """Invokes, commits and removes the precommit states of the blocks of stream in order
+
+    engine has to be opened on an empty state with stream.admin as the builtin SCORE owner.
+
+    :return: the number of blocks, blocks/sec, invoke time per block (ms), the state root hash
+        of every committed block and the heights where it differs from the recorded one
+    """
+    invoke_times = []
+    state_root_hashes = {}
+    divergences = []
+    recorded_root_hashes = {}
+    last_block: Optional[tuple] = None
+
+    start = perf_counter()
+    for record in stream:
+        if record[0] == INVOKE:
+            _, packed_block, tx_requests, recorded_root_hash = record
+            block = Block(*packed_block)
+
+            invoke_start = perf_counter()
+            _, state_root_hash, _, _ = engine.invoke(block=block, tx_requests=tx_requests)
+            invoke_times.append((perf_counter() - invoke_start) * 1000)
+
+            state_root_hashes[block.hash] = state_root_hash
+            recorded_root_hashes[block.hash] = recorded_root_hash
+        elif record[0] == COMMIT:
+            _, height, block_hash = record
+            engine.commit(height, block_hash, None)
+            last_block = (height, block_hash)
+            if state_root_hashes[block_hash] != recorded_root_hashes[block_hash]:
+                divergences.append(height)
+        elif record[0] == REMOVE_PRECOMMIT:
+            _, height, block_hash = record
+            engine.remove_precommit_state(height, block_hash)
+    elapsed = perf_counter() - start
+
+    return {
+        'blocks': len(invoke_times),
+        'elapsed': elapsed,
+        'blocks_per_sec': len(invoke_times) / elapsed if elapsed else 0.0,
+        'invoke_ms': {
+            'mean': sum(invoke_times) / len(invoke_times) if invoke_times else 0.0,
+            'p50': percentile(invoke_times, 50) if invoke_times else 0.0,
+            'p99': percentile(invoke_times, 99) if invoke_times else 0.0
+        },
+        'invoke_times': invoke_times,
+        'state_root_hashes': {block_hash.hex(): root_hash.hex() for block_hash, root_hash in state_root_hashes.items()},
+        'divergences': divergences,
+        'last_block': last_block
+    }
+
+
+def main() -> int:
+    from tests.test_integrate_base import TestIntegrateBase
+
+    class Replayer(TestIntegrateBase):
+        def runTest(self):
+            pass
+
+    parser = argparse.ArgumentParser(description='Replays a block stream on a fresh state')
+    parser.add_argument('path', help='the file written by BlockStream.write()')
+    parser.add_argument('-o', '--output', help='the path to write the report as JSON')
+    args = parser.parse_args()
+
+    Replayer.setUpClass()
+    replayer = Replayer()
+    try:
+        report = replayer.replay_blocks(BlockStream.read(args.path))
+        replayer.icon_service_engine.close()
+    finally:
+        Replayer.tearDownClass()
+
+    print(f"{report['blocks']} blocks in {report['elapsed']:.3f}s ({report['blocks_per_sec']:.1f} blocks/s), "
+          f"invoke p50 {report['invoke_ms']['p50']:.3f}ms p99 {report['invoke_ms']['p99']:.3f}ms, "
+          f"{len(report['divergences'])} diverged")
+    if args.output:
+        report['last_block'] = None if report['last_block'] is None else \
+            [report['last_block'][0], report['last_block'][1].hex()]
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 1 if report['divergences'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+
+from shutil import rmtree
+from typing import Callable, Iterable, Iterator, Optional
+
+from iconservice.base.address import Address
+
+from tests import copy_dir
+from tests.workload import WorkloadGenerator
+
+GENESIS_CACHE_META = 'meta.json'
+
+
+class GenesisAccounts:
+    """Accounts of the genesis transaction, reading all but the first two from their source on demand
+
+    put_genesis_accounts() of iconservice takes accounts[0] as the genesis account, accounts[1] as the treasury
+    and iterates accounts[2:], so thousands of accounts are written without being loaded up front.
+    """
+
+    def __init__(self, genesis: dict, treasury: dict, others: Callable[[], Iterable[dict]]):
+        """
+        :param genesis: the genesis account
+        :param treasury: the fee treasury account
+        :param others: returns a new iterable of the other accounts whenever called
+        """
+        self._genesis = genesis
+        self._treasury = treasury
+        self._others = others
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self._genesis
+        if index == 1:
+            return self._treasury
+        if isinstance(index, slice) and index.start == 2 and index.stop is None and index.step is None:
+            return iter(self._others())
+        raise IndexError(f"Unsupported index: {index}")
+
+    def __iter__(self) -> Iterator[dict]:
+        yield self._genesis
+        yield self._treasury
+        yield from self._others()
+
+    def __repr__(self):
+        return f'GenesisAccounts(genesis={self._genesis}, treasury={self._treasury})'
+
+
+def load_genesis_accounts(path: str) -> Iterator[dict]:
+    """Yields the accounts of a JSON lines fixture one by one
+
+    Each line is an object with "address" and "balance" (int or '0x' prefixed hex string) and an optional "name".
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            account = json.loads(line)
+            balance = account['balance']
+            yield {
+                'name': account.get('name', ''),
+                'address': Address.from_string(account['address']),
+                'balance': int(balance, 16) if isinstance(balance, str) else balance
+            }
+
+
+def generate_genesis_accounts(seed: int, count: int, balance: int) -> Iterator[dict]:
+    """Yields count accounts funded with balance whose addresses are generated from seed"""
+    workload = WorkloadGenerator(seed)
+    for index in range(count):
+        yield {'name': f'sender{index}', 'address': workload.address(), 'balance': balance}
+
+
+def genesis_digest(accounts: Iterable[dict], *extra: str) -> str:
+    """Returns the sha3_256 hex digest over the addresses and balances of accounts and extra"""
+    digest = hashlib.sha3_256()
+    for value in extra:
+        digest.update(value.encode())
+    for account in accounts:
+        digest.update(f"{account['address']}:{account['balance']};".encode())
+    return digest.hexdigest()
+
+
+def save_genesis_cache(cache_path: str, score_root_path: str, state_db_root_path: str, meta: dict):
+    """Saves the roots right after genesis in cache_path
+
+    The roots are copied to a temporary directory first and renamed, so a concurrent reader never sees
+    a partial cache and the first of concurrent writers wins.
+    """
+    temp_path = f'{cache_path}.{os.getpid()}.tmp'
+    copy_dir(score_root_path, os.path.join(temp_path, 'score'))
+    copy_dir(state_db_root_path, os.path.join(temp_path, 'statedb'))
+    with open(os.path.join(temp_path, GENESIS_CACHE_META), 'w') as f:
+        json.dump(meta, f)
+
+    try:
+        os.rename(temp_path, cache_path)
+    except OSError:
+        rmtree(temp_path, ignore_errors=True)
+
+
+def load_genesis_cache(cache_path: str, score_root_path: str, state_db_root_path: str) -> Optional[dict]:
+    """Restores the roots saved by save_genesis_cache()
+
+    :return: the meta saved with the roots or None if there is no cache
+    """
+    meta_path = os.path.join(cache_path, GENESIS_CACHE_META)
+    if not os.path.exists(meta_path):
+        return None
+
+    copy_dir(os.path.join(cache_path, 'score'), score_root_path)
+    copy_dir(os.path.join(cache_path, 'statedb'), state_db_root_path)
+    with open(meta_path) as f:
+        return json.load(f)
@@ -0,0 +1,12 @@
+from tests import create_address
+from tests.test_integrate_base import TestIntegrateBase
+from iconservice import *
+
+
+class HelloTestBase(TestIntegrateBase):
+    """Starts every test with the hello SCORE deployed as score_address by score_owner"""
+
+    def _prepare_state(self) -> dict:
+        score_owner: 'Address' = create_address()
+        score_address = self.deploy_score("hello", score_owner)
+        return {"score_owner": score_owner, "score_address": score_address}
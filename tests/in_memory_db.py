@@ -0,0 +1,115 @@
+import os
+
+from contextlib import contextmanager
+from typing import Dict, Optional, Iterator, Tuple
+from unittest.mock import patch
+
+from iconservice.database.db import KeyValueDatabase
+
+# Every in-memory database lives here by its absolute path, so it outlives the engine that opened it
+# just like a database on disk does.
+_stores: Dict[str, dict] = {}
+
+
+class InMemoryDB:
+    """Class for a plyvel.DB compatible key-value store kept in a dict."""
+
+    def __init__(self, store: dict, prefix: bytes = b''):
+        self._store = store
+        self._prefix = prefix
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._store.get(self._prefix + key)
+
+    def put(self, key: bytes, value: bytes):
+        self._store[self._prefix + key] = value
+
+    def delete(self, key: bytes):
+        self._store.pop(self._prefix + key, None)
+
+    def close(self):
+        pass
+
+    def prefixed_db(self, prefix: bytes) -> 'InMemoryDB':
+        return InMemoryDB(self._store, self._prefix + prefix)
+
+    @contextmanager
+    def iterator(self) -> Iterator[Iterator[Tuple[bytes, bytes]]]:
+        prefix_length = len(self._prefix)
+        items = sorted((key[prefix_length:], value) for key, value in self._store.items()
+                       if key.startswith(self._prefix))
+        yield iter(items)
+
+    @contextmanager
+    def write_batch(self) -> Iterator['InMemoryWriteBatch']:
+        batch = InMemoryWriteBatch(self)
+        yield batch
+        # Nothing is written if the batch is interrupted
+        batch.write()
+
+
+class InMemoryWriteBatch:
+    """Class for buffering writes to InMemoryDB and applying them at once."""
+
+    def __init__(self, db: 'InMemoryDB'):
+        self._db = db
+        self._writes = []
+
+    def put(self, key: bytes, value: bytes):
+        self._writes.append((key, value))
+
+    def delete(self, key: bytes):
+        self._writes.append((key, None))
+
+    def write(self):
+        for key, value in self._writes:
+            if value is None:
+                self._db.delete(key)
+            else:
+                self._db.put(key, value)
+        self._writes.clear()
+
+
+class InMemoryKeyValueDatabase:
+    """Drop-in for KeyValueDatabase.from_path() returning databases kept in memory."""
+
+    @staticmethod
+    def from_path(path: str, create_if_missing: bool = True) -> 'KeyValueDatabase':
+        path = os.path.abspath(path)
+        if path not in _stores:
+            if not create_if_missing:
+                raise FileNotFoundError(path)
+            _stores[path] = {}
+        return KeyValueDatabase(InMemoryDB(_stores[path]))
+
+
+@contextmanager
+def in_memory_state_db():
+    """Makes the state DB opened by IconServiceEngine.open() in the context an in-memory one.
+
+    The reward calculator databases stay on disk since they are handed over to the reward calculator process.
+    """
+    with patch('iconservice.database.factory.KeyValueDatabase', InMemoryKeyValueDatabase):
+        yield
+
+
+def clear_in_memory_db(root_path: str):
+    """Removes the in-memory databases under root_path."""
+    for path in _find_paths(root_path):
+        del _stores[path]
+
+
+def copy_in_memory_db(src_root_path: str, dst_root_path: str):
+    """Replaces the in-memory databases under dst_root_path with copies of those under src_root_path."""
+    clear_in_memory_db(dst_root_path)
+
+    src_root_path = os.path.abspath(src_root_path)
+    dst_root_path = os.path.abspath(dst_root_path)
+    for path in _find_paths(src_root_path):
+        relative_path = os.path.relpath(path, src_root_path)
+        _stores[os.path.join(dst_root_path, relative_path)] = dict(_stores[path])
+
+
+def _find_paths(root_path: str) -> list:
+    root_path = os.path.abspath(root_path)
+    return [path for path in _stores if path == root_path or path.startswith(root_path + os.sep)]
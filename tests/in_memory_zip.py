@@ -1,13 +1,25 @@
+import hashlib
 import io
 import os
 import zipfile
 
+from typing import Dict, Iterator, Tuple
+
+# Every entry gets the same timestamp and permissions so that the same files always make the same zip
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ZIP_FILE_ATTR = 0o644 << 16
+
+# Zips by package digest and compression, and digests by package path along with the file stamps they were made from
+_zip_cache: Dict[Tuple[str, int], str] = {}
+_digest_cache: Dict[str, Tuple[tuple, str]] = {}
+
 
 class InMemoryZip:
     """Class for Make zip data in memory using BytesIO."""
 
-    def __init__(self):
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED):
         self._in_memory = io.BytesIO()
+        self._compression = compression
 
     @property
     def data(self) -> bytes:
@@ -21,22 +33,78 @@ class InMemoryZip:
     def zip_in_memory(self, path):
         """Make zip data(bytes) in memory.
 
+        Entries are added in path order with relative names and fixed timestamps,
+        so the result only depends on the files and not on where they are.
+
         :param path: The path of the directory to be zipped.
         """
-        try:
-            with zipfile.ZipFile(self._in_memory, 'a', zipfile.ZIP_DEFLATED, False) as zf:
-                if os.path.isfile(path):
-                    zf.write(path)
-                else:
-                    for root, folders, files in os.walk(path):
-                        if root.find('__pycache__') != -1:
-                            continue
-                        if root.find('/.') != -1:
-                            continue
-                        for file in files:
-                            if file.startswith('.'):
-                                continue
-                            full_path = os.path.join(root, file)
-                            zf.write(full_path)
-        except:
-            raise Exception
+        with zipfile.ZipFile(self._in_memory, 'a', self._compression, False) as zf:
+            for full_path in walk_package(path):
+                # Entries are named relative to the parent of path, e.g. 'hello/hello.py'
+                info = zipfile.ZipInfo.from_file(full_path, arcname=os.path.relpath(full_path, os.path.dirname(path)))
+                info.date_time = ZIP_DATE_TIME
+                info.external_attr = ZIP_FILE_ATTR
+                info.compress_type = self._compression
+                with open(full_path, 'rb') as f:
+                    zf.writestr(info, f.read())
+
+
+def walk_package(path: str) -> Iterator[str]:
+    """Yields the files to be zipped under path in a fixed order, skipping hidden files and caches."""
+    if os.path.isfile(path):
+        yield path
+        return
+
+    for root, folders, files in os.walk(path):
+        folders.sort()
+        if root.find('__pycache__') != -1:
+            continue
+        if root.find('/.') != -1:
+            continue
+        for file in sorted(files):
+            if file.startswith('.'):
+                continue
+            yield os.path.join(root, file)
+
+
+def package_digest(path: str) -> str:
+    """Returns the sha3_256 hex digest over the entry names and contents of the files to be zipped.
+
+    The files are read again only when one of them is added, removed or has another mtime or size.
+    """
+    full_paths = list(walk_package(path))
+    stamps = []
+    for full_path in full_paths:
+        stat = os.stat(full_path)
+        stamps.append((full_path, stat.st_mtime_ns, stat.st_size))
+    stamps = tuple(stamps)
+
+    key = os.path.abspath(path)
+    cached = _digest_cache.get(key)
+    if cached is not None and cached[0] == stamps:
+        return cached[1]
+
+    digest = hashlib.sha3_256()
+    for full_path in full_paths:
+        digest.update(os.path.relpath(full_path, os.path.dirname(path)).encode())
+        with open(full_path, 'rb') as f:
+            digest.update(hashlib.sha3_256(f.read()).digest())
+    hex_digest = digest.hexdigest()
+    _digest_cache[key] = (stamps, hex_digest)
+    return hex_digest
+
+
+def zip_package(path: str, compression: int = zipfile.ZIP_DEFLATED) -> str:
+    """Returns the zip of path as a '0x' prefixed hex string.
+
+    The result is cached by package_digest(), so the same files are zipped only once, wherever they are.
+
+    :param path: The path of the directory to be zipped.
+    :param compression: zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED to skip compression
+    """
+    key = (package_digest(path), compression)
+    if key not in _zip_cache:
+        mz = InMemoryZip(compression)
+        mz.zip_in_memory(path)
+        _zip_cache[key] = f'0x{mz.data.hex()}'
+    return _zip_cache[key]
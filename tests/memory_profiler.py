@@ -0,0 +1,79 @@
+import json
+import tracemalloc
+
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class MemoryProfiler:
+    """Class for recording the peak and retained bytes allocated by operations with tracemalloc.
+
+    Measurements are grouped by operation and by size, the state size set by the test at the time.
+    Peak is the highest traced memory during the operation and retained is what is still allocated after it,
+    both relative to the traced memory before it.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self._records: Dict[str, Dict[int, List[Tuple[int, int]]]] = defaultdict(lambda: defaultdict(list))
+        self._started = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+
+    def stop(self):
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    @contextmanager
+    def measure(self, operation: str):
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self._records[operation][self.size].append((peak - before, current - before))
+
+    def curve(self, operation: str) -> List[Tuple[int, int, int]]:
+        """Returns (size, max peak bytes, max retained bytes) of operation in ascending order of size"""
+        return [(size, max(peak for peak, _ in values), max(retained for _, retained in values))
+                for size, values in sorted(self._records[operation].items())]
+
+    def report(self) -> dict:
+        return {
+            operation: [{'size': size, 'peak': peak, 'retained': retained}
+                        for size, peak, retained in self.curve(operation)]
+            for operation in sorted(self._records)
+        }
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def check(self, max_peak: Dict[str, int] = None, max_retained: Dict[str, int] = None) -> list:
+        """Checks the recorded bytes against ceilings
+
+        :param max_peak: operation -> the max peak bytes allowed at any size
+        :param max_retained: operation -> the max retained bytes allowed at any size
+        :return: descriptions of the exceeded ceilings
+        """
+        violations = []
+        for operation, limit in (max_peak or {}).items():
+            for size, peak, _ in self.curve(operation):
+                if peak > limit:
+                    violations.append(f'{operation}: peak {peak} bytes at size {size} exceeds {limit}')
+
+        for operation, limit in (max_retained or {}).items():
+            for size, _, retained in self.curve(operation):
+                if retained > limit:
+                    violations.append(f'{operation}: retained {retained} bytes at size {size} exceeds {limit}')
+        return violations
@@ -0,0 +1,66 @@
+import json
+import threading
+
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Tuple
+
+
+class QueryCache:
+    """Class for memoizing query results by block height and request with LRU eviction.
+
+    Results are copied on the way in and out, so callers may modify what they get.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        if max_size <= 0:
+            raise ValueError(f"Invalid max size: {max_size}")
+
+        self._max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(block_height: int, method: str, request: dict) -> Tuple[int, str, str]:
+        # Requests hold Address and bytes values, which are made hashable by their string forms
+        return block_height, method, json.dumps(request, sort_keys=True, default=str)
+
+    def get(self, key: tuple) -> Tuple[bool, Any]:
+        """Returns (True, the result) if key is cached and (False, None) otherwise"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False, None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return True, deepcopy(self._entries[key])
+
+    def put(self, key: tuple, result: Any):
+        with self._lock:
+            self._entries[key] = deepcopy(result)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drops the cached results, keeping the statistics"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,92 @@
+import threading
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, List, Optional, Tuple
+
+from tests.benchmark import percentile
+
+# (SCORE address, method, params)
+Query = Tuple['Address', str, Optional[dict]]
+
+
+class QueryLoadDriver:
+    """Class for firing read-only queries at the engine of a TestIntegrateBase from a thread pool.
+
+    Queries run against the committed state. A writer can commit blocks from another thread at the same time
+    to measure how the readers are affected by invoke and commit.
+    """
+
+    def __init__(self, test: 'TestIntegrateBase', queries: List[Query], workers: int = 4):
+        """
+        :param test: the test whose engine is queried
+        :param queries: queries issued in turn
+        :param workers: the number of reader threads
+        """
+        if not queries:
+            raise ValueError("No queries")
+
+        self._test = test
+        self._queries = queries
+        self._workers = workers
+
+    def run(self, query_count: int, writer: Optional[Callable[[], None]] = None) -> dict:
+        """Issues query_count queries and returns the load report
+
+        :param query_count: the total number of queries
+        :param writer: commits a block when called. called repeatedly in a thread while the readers run
+        :return: the number of queries, errors and blocks, throughput (query/s) and p50/p99 latency (ms)
+        """
+        done = threading.Event()
+        writer_result = {'blocks': 0, 'error': None}
+        writer_thread = None
+        if writer is not None:
+            writer_thread = threading.Thread(target=self._write, args=(writer, done, writer_result))
+            writer_thread.start()
+
+        start = perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                results = list(executor.map(self._query, range(query_count)))
+        finally:
+            elapsed = perf_counter() - start
+            done.set()
+            if writer_thread is not None:
+                writer_thread.join()
+
+        latencies = [latency for latency, _ in results]
+        errors = Counter(error for _, error in results if error is not None)
+        return {
+            'queries': query_count,
+            'workers': self._workers,
+            'throughput': query_count / elapsed,
+            'p50': percentile(latencies, 50),
+            'p99': percentile(latencies, 99),
+            'errors': sum(errors.values()),
+            'error_types': dict(errors),
+            'blocks': writer_result['blocks'],
+            'writer_error': writer_result['error']
+        }
+
+    def _query(self, index: int) -> Tuple[float, Optional[str]]:
+        score_address, method, params = self._queries[index % len(self._queries)]
+        error = None
+        start = perf_counter()
+        try:
+            self._test.query(score_address, method, params)
+        except Exception as e:
+            error = type(e).__name__
+        return (perf_counter() - start) * 1000, error
+
+    @staticmethod
+    def _write(writer: Callable[[], None], done: threading.Event, result: dict):
+        # Commits at least one block even if the readers finish first
+        try:
+            while True:
+                writer()
+                result['blocks'] += 1
+                if done.is_set():
+                    break
+        except Exception as e:
+            result['error'] = repr(e)
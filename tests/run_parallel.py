@@ -0,0 +1,70 @@
+"""Runs test classes in parallel, one class at a time per worker process
+
+usage: python -m tests.run_parallel [-j WORKERS] [-p PATTERN]
+"""
+import argparse
+import io
+import os
+import sys
+import unittest
+
+from concurrent.futures import ProcessPoolExecutor
+
+from tests import TEST_ROOT_PATH
+
+_FAILED_TEST_PREFIX = 'unittest.loader._FailedTest.'
+
+
+def find_test_classes(pattern: str) -> list:
+    """Returns the ids ('module.Class') of the test classes under tests/ in discovery order"""
+    suite = unittest.defaultTestLoader.discover(os.path.join(TEST_ROOT_PATH, 'tests'),
+                                                pattern=pattern,
+                                                top_level_dir=TEST_ROOT_PATH)
+    class_ids = []
+    for test in _iter_tests(suite):
+        if test.id().startswith(_FAILED_TEST_PREFIX):
+            # A module that failed to import. Loading it again in a worker reports the error
+            class_id = test.id()[len(_FAILED_TEST_PREFIX):]
+        else:
+            class_id = f'{type(test).__module__}.{type(test).__qualname__}'
+        if class_id not in class_ids:
+            class_ids.append(class_id)
+    return class_ids
+
+
+def run_test_class(class_id: str) -> tuple:
+    stream = io.StringIO()
+    suite = unittest.defaultTestLoader.loadTestsFromName(class_id)
+    result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+    return class_id, result.testsRun, len(result.failures) + len(result.errors), stream.getvalue()
+
+
+def _iter_tests(suite: unittest.TestSuite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        else:
+            yield test
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Runs test classes in parallel')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='the number of processes')
+    parser.add_argument('-p', '--pattern', default='test*.py', help='the file name pattern of test modules')
+    args = parser.parse_args()
+
+    class_ids = find_test_classes(args.pattern)
+
+    total_run = total_failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for class_id, tests_run, failed, output in executor.map(run_test_class, class_ids):
+            print(output, end='')
+            total_run += tests_run
+            total_failed += failed
+
+    print(f'{len(class_ids)} classes, {total_run} tests, {total_failed} failed')
+    return 1 if total_failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
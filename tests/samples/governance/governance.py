@@ -0,0 +1,29 @@
+from iconservice import *
+from iconservice.builtin_scores.governance.governance import Governance as BuiltinGovernance
+
+
+class Governance(BuiltinGovernance):
+    """
+    The builtin governance with a revision code, which the engine reads
+    to decide the revision every block is invoked with.
+    """
+
+    def __init__(self, db: IconScoreDatabase) -> None:
+        super().__init__(db)
+        self._revision_code = VarDB('revision_code', db, value_type=int)
+
+    @property
+    def revision_code(self) -> int:
+        return self._revision_code.get()
+
+    @external
+    def setRevision(self, code: int) -> None:
+        if self.msg.sender != self.owner:
+            self.revert('Invalid sender: not owner')
+        if code < self._revision_code.get():
+            self.revert(f'Revision can not go back: {code}')
+        self._revision_code.set(code)
+
+    @external(readonly=True)
+    def getRevision(self) -> int:
+        return self._revision_code.get()
@@ -0,0 +1,62 @@
+import json
+
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+class StepProfiler:
+    """Class for recording the step used by transactions per method and input size."""
+
+    def __init__(self):
+        self._records: Dict[str, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
+
+    def record(self, method: str, size: int, step_used: int):
+        self._records[method][size].append(step_used)
+
+    def cost_curve(self, method: str) -> List[Tuple[int, float]]:
+        """Returns (input size, mean step used) of method in ascending order of size"""
+        return [(size, sum(steps) / len(steps)) for size, steps in sorted(self._records[method].items())]
+
+    def growth(self, method: str) -> float:
+        """Returns the least squares slope of the cost curve, i.e. the step used per unit of input size"""
+        curve = self.cost_curve(method)
+        if len(curve) < 2:
+            return 0.0
+
+        mean_size = sum(size for size, _ in curve) / len(curve)
+        mean_step = sum(step for _, step in curve) / len(curve)
+        covariance = sum((size - mean_size) * (step - mean_step) for size, step in curve)
+        variance = sum((size - mean_size) ** 2 for size, _ in curve)
+        return covariance / variance
+
+    def report(self) -> dict:
+        return {
+            method: {
+                'growth': self.growth(method),
+                'curve': [{'size': size, 'step_used': step} for size, step in self.cost_curve(method)]
+            }
+            for method in sorted(self._records)
+        }
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def check(self, max_step_used: Dict[str, int] = None, max_growth: Dict[str, float] = None) -> list:
+        """Checks the recorded steps against thresholds
+
+        :param max_step_used: method -> the max step used allowed at any input size
+        :param max_growth: method -> the max step used allowed per unit of input size
+        :return: descriptions of the exceeded thresholds
+        """
+        violations = []
+        for method, limit in (max_step_used or {}).items():
+            for size, step in self.cost_curve(method):
+                if step > limit:
+                    violations.append(f'{method}: step used {step:.0f} at size {size} exceeds {limit}')
+
+        for method, limit in (max_growth or {}).items():
+            growth = self.growth(method)
+            if growth > limit:
+                violations.append(f'{method}: step used grows {growth:.2f} per size, exceeds {limit}')
+        return violations
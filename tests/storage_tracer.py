@@ -0,0 +1,98 @@
+from collections import defaultdict
+from typing import Dict, Optional
+from unittest.mock import patch
+
+from iconservice.base.address import Address
+from iconservice.database.db import IconScoreDatabase
+
+OPERATIONS = ('get', 'put', 'delete')
+
+
+class StorageTracer:
+    """Class for counting the state DB accesses of SCOREs per method and container.
+
+    Accesses in a transaction are attributed to the method given by label_tx() for its tx hash,
+    and accesses in a query to the method given by set_query().
+    Containers are named after the key of the VarDB, DictDB or ArrayDB, e.g. 'array_db'.
+    """
+
+    def __init__(self, score_address: Optional['Address'] = None):
+        """
+        :param score_address: traces only this SCORE if given
+        """
+        self.score_address = score_address
+        self._tx_methods: Dict[bytes, str] = {}
+        self._query_method: Optional[str] = None
+        self._query_count = 0
+        self._calls: Dict[str, set] = defaultdict(set)
+        self._counts: Dict[str, Dict[str, Dict[str, int]]] = \
+            defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+        self._patches = [
+            patch.object(IconScoreDatabase, operation, self._wrap(operation, getattr(IconScoreDatabase, operation)))
+            for operation in OPERATIONS
+        ]
+
+    def start(self):
+        for p in self._patches:
+            p.start()
+
+    def stop(self):
+        for p in self._patches:
+            p.stop()
+
+    def reset(self):
+        self._calls.clear()
+        self._counts.clear()
+
+    def label_tx(self, tx_hash: bytes, method: str):
+        self._tx_methods[tx_hash] = method
+
+    def set_query(self, method: Optional[str]):
+        """Attributes the accesses outside transactions to method until the next call"""
+        self._query_method = method
+        self._query_count += 1
+
+    def report(self) -> dict:
+        """Returns method -> container -> the number of gets, puts and deletes and the bytes read and written
+
+        Each method also has 'calls', the number of transactions and queries it was traced in.
+        """
+        report = {}
+        for method, containers in self._counts.items():
+            report[method] = {container: dict(counts) for container, counts in containers.items()}
+            report[method]['calls'] = len(self._calls[method])
+        return report
+
+    def _wrap(self, operation: str, func: callable) -> callable:
+        tracer = self
+
+        def traced(db: 'IconScoreDatabase', key: bytes, *args):
+            result = func(db, key, *args)
+            if tracer.score_address is None or db.address == tracer.score_address:
+                value = result if operation == 'get' else (args[0] if args else None)
+                tracer._record(db, operation, key, value)
+            return result
+        return traced
+
+    def _record(self, db: 'IconScoreDatabase', operation: str, key: bytes, value: Optional[bytes]):
+        context = db._context
+        tx_hash = context.tx.hash if context.tx else None
+        if tx_hash in self._tx_methods:
+            method, call = self._tx_methods[tx_hash], tx_hash
+        else:
+            method, call = self._query_method, self._query_count
+        if method is None:
+            return
+
+        self._calls[method].add(call)
+        counts = self._counts[method][self._get_container(key)]
+        counts[operation] += 1
+        counts[f'{operation}_bytes'] += len(key) + (len(value) if value else 0)
+
+    @staticmethod
+    def _get_container(key: bytes) -> str:
+        # Container keys are b'<container id>|<name>|...'
+        parts = key.split(b'|', 2)
+        if len(parts) < 2:
+            return key.decode(errors='replace')
+        return parts[1].decode(errors='replace')
@@ -0,0 +1,162 @@
+import json
+import os
+
+from time import perf_counter
+from unittest import skipUnless
+
+from tests.benchmark import BenchmarkReport, percentile, DEFAULT_REPORT_PATH
+from tests.query_load import QueryLoadDriver
+from tests.hello_test_base import HelloTestBase
+from iconservice import *
+
+BENCHMARK_ENABLED = os.environ.get('HELLO_BENCHMARK') == '1'
+REPORT_PATH = os.environ.get('HELLO_BENCHMARK_OUTPUT', DEFAULT_REPORT_PATH)
+BASELINE_PATH = os.environ.get('HELLO_BENCHMARK_BASELINE')
+TOLERANCE = float(os.environ.get('HELLO_BENCHMARK_TOLERANCE', '0.2'))
+
+BLOCK_SIZES = (1, 10, 100)
+TX_COUNT = 200
+DATA_SIZES = (10, 100, 1000)
+QUERY_COUNT = 200
+PERCENTILES = (50, 90, 99)
+BATCH_SIZE = 100
+LOAD_WORKERS = (1, 4, 16)
+LOAD_QUERY_COUNT = 1000
+FORK_WIDTHS = (1, 2, 4)
+FORK_ROUNDS = 20
+FORK_BLOCK_SIZE = 10
+
+
+@skipUnless(BENCHMARK_ENABLED, "set HELLO_BENCHMARK=1 to run benchmarks")
+class TestBenchmarkHello(HelloTestBase):
+    """Measures the transaction throughput and the query latency of the Hello SCORE
+
+    Results are written to HELLO_BENCHMARK_OUTPUT (bench_output.txt) as JSON.
+    If HELLO_BENCHMARK_BASELINE names a previous report, a test fails when one of its results is
+    worse than the baseline by more than HELLO_BENCHMARK_TOLERANCE (0.2 = 20%).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = BenchmarkReport()
+
+    def test_tx_throughput(self):
+        make_txs = {
+            'setVar': lambda index: self._make_score_call_tx(self.score_owner, self.score_address,
+                                                             'setVar', {"data": str(index)}),
+            'appendArray': lambda index: self._make_score_call_tx(self.score_owner, self.score_address,
+                                                                  'appendArray', {"data": str(index)}),
+            'setDict': lambda index: self._make_score_call_tx(self.score_owner, self.score_address,
+                                                              'setDict', {"key": str(index), "value": str(index)}),
+            'transfer': lambda index: self._make_icx_send_tx(self.genesis, self.owner1, 1)
+        }
+
+        names = []
+        for method, make_tx in make_txs.items():
+            for block_size in BLOCK_SIZES:
+                tx_list = [make_tx(index) for index in range(TX_COUNT)]
+
+                start = perf_counter()
+                self.send_txs(tx_list, block_size)
+                elapsed = perf_counter() - start
+
+                name = f'tps.{method}.block_{block_size}'
+                self.report.add(name, TX_COUNT / elapsed, 'tx/s', True, block_size=block_size, tx_count=TX_COUNT)
+                names.append(name)
+
+        self._finish(names)
+
+    def test_query_latency(self):
+        queries = (('getVar', None), ('getDict', {"key": "0"}), ('getArray', None))
+
+        names = []
+        stored_size = 0
+        for data_size in DATA_SIZES:
+            self._grow_data(stored_size, data_size)
+            stored_size = data_size
+
+            for method, params in queries:
+                latencies = []
+                for _ in range(QUERY_COUNT):
+                    start = perf_counter()
+                    self.query(self.score_address, method, params)
+                    latencies.append((perf_counter() - start) * 1000)
+
+                for q in PERCENTILES:
+                    name = f'latency.{method}.size_{data_size}.p{q}'
+                    self.report.add(name, percentile(latencies, q), 'ms', False, data_size=data_size)
+                    names.append(name)
+
+        self._finish(names)
+
+    def test_concurrent_query_load(self):
+        self._grow_data(0, DATA_SIZES[0])
+        driver_queries = [(self.score_address, 'hello', None),
+                          (self.score_address, 'getVar', None),
+                          (self.score_address, 'getDict', {"key": "0"}),
+                          (self.score_address, 'getArray', None)]
+
+        def write():
+            self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "x"})
+
+        names = []
+        for workers in LOAD_WORKERS:
+            for mode, writer in (('read', None), ('read_write', write)):
+                result = QueryLoadDriver(self, driver_queries, workers).run(LOAD_QUERY_COUNT, writer)
+                self.assertEqual(0, result['errors'], result['error_types'])
+                self.assertIsNone(result['writer_error'])
+
+                prefix = f'load.{mode}.workers_{workers}'
+                self.report.add(f'{prefix}.qps', result['throughput'], 'query/s', True,
+                                workers=workers, blocks=result['blocks'])
+                for q in (50, 99):
+                    self.report.add(f'{prefix}.p{q}', result[f'p{q}'], 'ms', False, workers=workers)
+                names.extend([f'{prefix}.qps', f'{prefix}.p50', f'{prefix}.p99'])
+
+        self._finish(names)
+
+    def test_fork_cost(self):
+        names = []
+        for width in FORK_WIDTHS:
+            invoke_times, remove_times, commit_times, precommit_sizes = [], [], [], []
+            for round_index in range(FORK_ROUNDS):
+                candidates = [[self._make_score_call_tx(self.score_owner, self.score_address, 'setDict',
+                                                        {"key": f'{round_index}.{tx_index}', "value": str(fork)})
+                               for tx_index in range(FORK_BLOCK_SIZE)]
+                              for fork in range(width)]
+                for candidate in self.invoke_competing_blocks(candidates)['candidates']:
+                    invoke_times.append(candidate['invoke_ms'])
+                    precommit_sizes.append(candidate['precommit_bytes'])
+                    (commit_times if candidate['committed'] else remove_times).append(candidate['finish_ms'])
+
+            results = {'invoke_ms': (invoke_times, 'ms'),
+                       'commit_ms': (commit_times, 'ms'),
+                       'remove_ms': (remove_times, 'ms'),
+                       'precommit_bytes': (precommit_sizes, 'bytes')}
+            for result, (values, unit) in results.items():
+                if not values:
+                    continue
+                name = f'fork.width_{width}.{result}'
+                self.report.add(name, sum(values) / len(values), unit, False, width=width, block_size=FORK_BLOCK_SIZE)
+                names.append(name)
+
+        self._finish(names)
+
+    def _grow_data(self, stored_size: int, data_size: int):
+        """Grows the array and the dict to data_size items and the var to data_size bytes"""
+        tx_list = [self._make_score_call_tx(self.score_owner, self.score_address, 'setVar', {"data": "x" * data_size})]
+        for start in range(stored_size, data_size, BATCH_SIZE):
+            indexes = range(start, min(start + BATCH_SIZE, data_size))
+            tx_list.append(self._make_score_call_tx(self.score_owner, self.score_address, 'appendArrayBatch',
+                                                    {"data": json.dumps([str(index) for index in indexes]),
+                                                     "summary": "0x1"}))
+            entries = {str(index): str(index) for index in indexes}
+            tx_list.append(self._make_score_call_tx(self.score_owner, self.score_address, 'setDictBatch',
+                                                    {"entries": json.dumps(entries), "summary": "0x1"}))
+        self.send_txs(tx_list)
+
+    def _finish(self, names: list):
+        self.report.write(REPORT_PATH)
+        regressions = self.report.compare(BASELINE_PATH, TOLERANCE, names)
+        self.assertEqual([], regressions)
@@ -0,0 +1,45 @@
+import os
+
+from tests.block_stream import BlockStream
+from tests.hello_test_base import HelloTestBase
+from iconservice import *
+
+
+class TestBlockStreamHello(HelloTestBase):
+    _record_blocks = True
+
+    def _run_scenario(self):
+        self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "var"})
+        tx = self._make_score_call_tx(self.score_owner, self.score_address, 'appendArray', {"data": "dropped"})
+        prev_block, _ = self._make_and_req_block([tx])
+        self._remove_precommit_state(prev_block)
+        for index in range(3):
+            self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": str(index)})
+        self.icx_send_tx(self.genesis, self.owner1, 1)
+
+    def test_replay(self):
+        self._run_scenario()
+        path = os.path.join(self._test_root_path, 'blocks.gz')
+        self.block_stream.write(path)
+        block_height = self._block_height
+
+        report = self.replay_blocks(BlockStream.read(path))
+
+        # genesis, deploy, setVar, the removed block, 3 appendArray and the transfer
+        self.assertEqual(8, report['blocks'])
+        self.assertEqual([], report['divergences'])
+        self.assertEqual(block_height, self._block_height)
+        self.assertEqual("var", self.query(self.score_address, 'getVar'))
+        self.assertEqual(["0", "1", "2"], self.query(self.score_address, 'getArray'))
+
+        # The replayed state accepts new blocks
+        self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "next"})
+        self.assertEqual("next", self.query(self.score_address, 'getVar'))
+
+    def test_same_stream_after_snapshot(self):
+        self._run_scenario()
+
+        # genesis and the deploy come from the snapshot of the first test
+        operations = [record[0] for record in self.block_stream]
+        self.assertEqual(['invoke', 'commit', 'invoke', 'commit'], operations[:4])
+        self.assertEqual(1, operations.count('remove_precommit'))
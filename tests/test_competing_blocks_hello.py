@@ -0,0 +1,82 @@
+import json
+
+from iconservice.base.address import GOVERNANCE_SCORE_ADDRESS
+from iconservice.icon_constant import Revision
+
+from tests.hello_test_base import HelloTestBase
+from iconservice import *
+
+
+class TestCompetingBlocksHello(HelloTestBase):
+
+    def _make_set_var_tx(self, value: str) -> dict:
+        return self._make_score_call_tx(self.score_owner, self.score_address, 'setVar', {"data": value})
+
+    def _make_set_dict_tx(self, key: str) -> dict:
+        return self._make_score_call_tx(self.score_owner, self.score_address, 'setDict', {"key": key, "value": key})
+
+    def test_commit_winner(self):
+        block_height = self._block_height
+        candidates = [[self._make_set_var_tx(value), self._make_set_dict_tx(value)] for value in ("a", "b", "c")]
+
+        report = self.invoke_competing_blocks(candidates, winner=1)
+
+        self.assertEqual(block_height + 1, self._block_height)
+        self.assertEqual("b", self.query(self.score_address, 'getVar'))
+        self.assertEqual("b", self.query(self.score_address, 'getVarAt', {"height": hex(block_height)}))
+        self.assertEqual("", self.query(self.score_address, 'getVarAt', {"height": hex(block_height - 1)}))
+        self.assertEqual(["b"], self.query(self.score_address, 'getDictKeys'))
+        self.assertEqual(1, self.query(self.score_address, 'getDictSize'))
+        self.assertEqual(int(True), report['tx_results'][0].status)
+        self.assertEqual([False, True, False], [candidate['committed'] for candidate in report['candidates']])
+        for candidate in report['candidates']:
+            self.assertGreater(candidate['precommit_bytes'], 0)
+            self.assertIn('finish_ms', candidate)
+
+        # The next block builds on the winner
+        self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "next"})
+        self.assertEqual(["next"], self.query(self.score_address, 'getArray'))
+
+    def test_shared_transactions(self):
+        shared_tx = self._make_set_var_tx("shared")
+        batch_tx = self._make_score_call_tx(self.score_owner, self.score_address, 'appendArrayBatch',
+                                            {"data": json.dumps([str(index) for index in range(50)])})
+
+        report = self.invoke_competing_blocks([[shared_tx], [shared_tx, batch_tx]], winner=0)
+
+        small, large = report['candidates']
+        self.assertGreater(large['precommit_bytes'], small['precommit_bytes'])
+        self.assertEqual("shared", self.query(self.score_address, 'getVar'))
+        self.assertEqual(0, self.query(self.score_address, 'getArrayLength'))
+
+    def test_containers_after_fork(self):
+        block_height = self._block_height
+        loser = [self._make_score_call_tx(self.score_owner, self.score_address, 'appendArrayBatch',
+                                          {"data": json.dumps([str(index) for index in range(20)])}),
+                 self._make_set_dict_tx("loser"),
+                 self._make_set_var_tx("loser")]
+        winner = [self._make_score_call_tx(self.score_owner, self.score_address, 'appendArray', {"data": "winner"}),
+                  self._make_set_dict_tx("winner"),
+                  self._make_set_var_tx("winner")]
+
+        self.invoke_competing_blocks([loser, winner], winner=1)
+
+        # Nothing the removed block wrote, including the sizes of the containers, survives in the winner
+        self.assertEqual(["winner"], self.query(self.score_address, 'getArray'))
+        self.assertEqual(1, self.query(self.score_address, 'getArrayLength'))
+        self.assertEqual(["winner"], self.query(self.score_address, 'getDictKeys'))
+        self.assertEqual(1, self.query(self.score_address, 'getDictSize'))
+        self.assertEqual({"length": 1, "distinct": 1}, self.query(self.score_address, 'getArrayStats'))
+        self.assertEqual("winner", self.query(self.score_address, 'getVarAt', {"height": hex(block_height)}))
+
+        self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "next"})
+        self.assertEqual("winner", self.query(self.score_address, 'getVarAt', {"height": hex(block_height)}))
+        self.assertEqual("next", self.query(self.score_address, 'getVarAt', {"height": hex(block_height + 1)}))
+
+
+class TestCompetingBlocksHelloRevision3(TestCompetingBlocksHello):
+    # From Revision.THREE on, an ArrayDB reads its size from the state instead of keeping it in the SCORE instance
+    _revision = Revision.THREE.value
+
+    def test_revision(self):
+        self.assertEqual(Revision.THREE.value, self.query(GOVERNANCE_SCORE_ADDRESS, 'getRevision'))
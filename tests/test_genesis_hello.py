@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+
+from shutil import rmtree
+from unittest import TestCase
+
+from tests import create_address
+from tests.genesis import GenesisAccounts, GENESIS_CACHE_META
+from tests.hello_test_base import HelloTestBase
+from tests.test_integrate_base import TestIntegrateBase
+from iconservice import *
+
+SENDER_COUNT = 100
+FIXTURE_BALANCE = 7 * 10 ** 18
+
+
+class TestGenesisAccounts(TestCase):
+
+    def test_stream_others(self):
+        calls = []
+
+        def others():
+            calls.append(1)
+            yield {"address": "c"}
+
+        accounts = GenesisAccounts({"address": "a"}, {"address": "b"}, others)
+
+        self.assertEqual({"address": "a"}, accounts[0])
+        self.assertEqual({"address": "b"}, accounts[1])
+        self.assertEqual([], calls)
+        self.assertEqual([{"address": "c"}], list(accounts[2:]))
+        self.assertEqual(["a", "b", "c"], [account["address"] for account in accounts])
+        self.assertRaises(IndexError, accounts.__getitem__, 2)
+
+
+class TestGenesisHello(HelloTestBase):
+    _genesis_account_count = SENDER_COUNT
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.fixture_accounts = [create_address() for _ in range(3)]
+        cls._genesis_fixture = os.path.join(cls._test_root_path, 'genesis.jsonl')
+        with open(cls._genesis_fixture, 'w') as f:
+            for address in cls.fixture_accounts:
+                f.write(json.dumps({"address": str(address), "balance": hex(FIXTURE_BALANCE)}) + '\n')
+
+    def _get_balance(self, address: 'Address') -> int:
+        return self._query({"address": address}, 'icx_getBalance')
+
+    def test_funded_accounts(self):
+        senders = self.genesis_senders()
+
+        self.assertEqual(SENDER_COUNT, len(set(senders)))
+        self.assertEqual(self._genesis_account_balance, self._get_balance(senders[-1]))
+        for address in self.fixture_accounts:
+            self.assertEqual(FIXTURE_BALANCE, self._get_balance(address))
+
+    def test_many_senders(self):
+        workload = self._make_workload(1)
+        template = workload.call_template(None, self.score_address, 'setDict')
+        tx_list = workload.make_txs(template, SENDER_COUNT, self.genesis_senders(),
+                                    lambda index: {"key": str(index), "value": "v"})
+
+        self.send_txs(tx_list, block_size=50)
+
+        self.assertEqual("v", self.query(self.score_address, 'getDict', {"key": str(SENDER_COUNT - 1)}))
+
+
+class TestGenesisCache(TestIntegrateBase):
+    _use_state_snapshot = False
+    _genesis_account_count = SENDER_COUNT
+    _genesis_cache_root = os.path.join(tempfile.gettempdir(), 'hello_genesis_cache_test')
+
+    @classmethod
+    def setUpClass(cls):
+        rmtree(cls._genesis_cache_root, ignore_errors=True)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        rmtree(cls._genesis_cache_root, ignore_errors=True)
+
+    def test_restore_genesis(self):
+        cache_path = self._get_genesis_cache_path()
+        self.assertTrue(os.path.exists(os.path.join(cache_path, GENESIS_CACHE_META)))
+        block_height = self._block_height
+        sender = self.genesis_senders()[0]
+
+        self.icon_service_engine.close()
+        self._clear_roots()
+        self._block_height = 0
+        self._prev_block_hash = None
+        self._setup_genesis()
+
+        self.assertEqual(block_height, self._block_height)
+        self.assertEqual(self._genesis_account_balance, self._query({"address": sender}, 'icx_getBalance'))
+        self.icx_send_tx(sender, self.owner1, 1)
@@ -0,0 +1,66 @@
+import io
+import os
+import tempfile
+import zipfile
+
+from shutil import rmtree, copytree
+from unittest import TestCase
+
+from tests import get_score_path
+from tests.in_memory_zip import InMemoryZip, package_digest, zip_package
+
+
+class TestInMemoryZip(TestCase):
+
+    def setUp(self):
+        self._temp_path = tempfile.mkdtemp()
+        self.addCleanup(rmtree, self._temp_path, ignore_errors=True)
+
+    @staticmethod
+    def _zip(path: str) -> bytes:
+        mz = InMemoryZip()
+        mz.zip_in_memory(path)
+        return mz.data
+
+    def test_relative_names(self):
+        data = self._zip(get_score_path("", "hello"))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            names = zf.namelist()
+        self.assertIn('hello/hello.py', names)
+        self.assertIn('hello/package.json', names)
+        self.assertTrue(all(name.startswith('hello/') for name in names))
+
+    def test_same_zip_at_another_path(self):
+        path = get_score_path("", "hello")
+        copy_path = os.path.join(self._temp_path, 'hello')
+        copytree(path, copy_path)
+
+        self.assertEqual(self._zip(path), self._zip(copy_path))
+
+    def test_digest_follows_changes(self):
+        path = os.path.join(self._temp_path, 'hello')
+        copytree(get_score_path("", "hello"), path)
+        digest = package_digest(path)
+        data = zip_package(path)
+
+        module_path = os.path.join(path, 'hello.py')
+        with open(module_path, 'a') as f:
+            f.write('\n')
+
+        self.assertNotEqual(digest, package_digest(path))
+        self.assertNotEqual(data, zip_package(path))
+
+    def test_digest_of_unchanged_files(self):
+        path = os.path.join(self._temp_path, 'hello')
+        copytree(get_score_path("", "hello"), path)
+        digest = package_digest(path)
+
+        # The same mtime and size keep the digest without reading the file
+        module_path = os.path.join(path, 'hello.py')
+        stat = os.stat(module_path)
+        with open(module_path, 'r+b') as f:
+            f.write(b'#')
+        os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(digest, package_digest(path))
@@ -16,31 +16,82 @@
 
 """IconServiceEngine testcase
 """
+import os
+import tempfile
+import zipfile
+
+from contextlib import nullcontext
+from importlib.metadata import version, PackageNotFoundError
+from shutil import rmtree
+from time import perf_counter
 from unittest import TestCase
 
-from typing import TYPE_CHECKING, Union, Optional, Any
+from typing import TYPE_CHECKING, Union, Optional, Any, Iterator, List
 
 from iconcommons import IconConfig
 from iconservice.base.block import Block
 from iconservice.icon_config import default_icon_config
-from iconservice.base.address import ZERO_SCORE_ADDRESS
+from iconservice.base.address import ZERO_SCORE_ADDRESS, GOVERNANCE_SCORE_ADDRESS
 from iconservice.icon_constant import ConfigKey
 from iconservice.icon_service_engine import IconServiceEngine
 from iconservice.base.address import Address
 from tests import create_address, create_tx_hash, create_block_hash
-from tests import root_clear, create_timestamp, get_score_path
-from tests.in_memory_zip import InMemoryZip
+from tests import root_clear, create_timestamp, get_score_path, copy_dir
+from tests.block_stream import BlockStream, replay_block_stream
+from tests.genesis import GenesisAccounts, load_genesis_accounts, generate_genesis_accounts, genesis_digest
+from tests.genesis import save_genesis_cache, load_genesis_cache
+from tests.in_memory_db import in_memory_state_db, clear_in_memory_db, copy_in_memory_db
+from tests.in_memory_zip import zip_package
+from tests.memory_profiler import MemoryProfiler
+from tests.query_cache import QueryCache
+from tests.step_profiler import StepProfiler
+from tests.storage_tracer import StorageTracer
+from tests.workload import WorkloadGenerator
 
 if TYPE_CHECKING:
     from iconservice.base.address import Address, MalformedAddress
 
 
 class TestIntegrateBase(TestCase):
+    # Runs genesis and _prepare_state() once per class and restores their result before each test
+    _use_state_snapshot = True
+    # Keeps the state DB in memory instead of LevelDB files under _state_db_root_path
+    _use_in_memory_db = False
+    # zipfile.ZIP_STORED skips compressing SCORE packages on deploy
+    _deploy_zip_compression = zipfile.ZIP_DEFLATED
+    # Records the step used by every transaction in step_profiler, see _step_input_size()
+    _profile_steps = False
+    # Counts the state DB accesses of SCOREs per method and container in storage_tracer
+    _trace_storage = False
+    # Memoizes query results in query_cache until the next commit or removed precommit state
+    _cache_queries = False
+    # Records the memory allocated by invoke, commit and query in memory_profiler. Slows everything down
+    _profile_memory = False
+    # Records every block from genesis in block_stream to be written and replayed by replay_blocks()
+    _record_blocks = False
+    _query_cache_size = 1024
+    # JSON lines of accounts funded at genesis in addition to the default ones, see load_genesis_accounts()
+    _genesis_fixture: Optional[str] = None
+    # The number of accounts funded at genesis whose addresses are generated from _genesis_seed, see genesis_senders()
+    _genesis_account_count = 0
+    _genesis_account_balance = 100 * 10 ** 18
+    _genesis_seed = 0
+    # Keeps the state right after genesis under this directory across runs, keyed by the genesis accounts.
+    # The default accounts are derived from _genesis_seed instead of random so that the key stays the same.
+    # Not used with _use_in_memory_db
+    _genesis_cache_root: Optional[str] = None
+    # The revision set right after genesis, see _set_revision().
+    # None keeps the builtin governance, which has no revision code, so blocks run at revision 0
+    _revision: Optional[int] = None
 
     @classmethod
     def setUpClass(cls):
-        cls._score_root_path = '.score'
-        cls._state_db_root_path = '.statedb'
+        # Every class gets its own roots, so test processes running side by side do not share any state
+        cls._test_root_path = tempfile.mkdtemp(prefix=f'{cls.__name__}_')
+        cls._score_root_path = os.path.join(cls._test_root_path, '.score')
+        cls._state_db_root_path = os.path.join(cls._test_root_path, '.statedb')
+        cls._snapshot_root_path = os.path.join(cls._test_root_path, '.snapshot')
+        cls._state_snapshot = None
         cls._test_sample_root = ""
         cls._signature = "VAia7YZ2Ji6igKWzjR2YsGa2m53nKPrfK7uXYW78QLE+ATehAVZPC40szvAiA6NEU5gCYB4c4qaQzqDh2ugcHgA="
 
@@ -56,12 +107,88 @@ class TestIntegrateBase(TestCase):
 
         cls._fee_treasury: 'Address' = create_address()
 
+        if cls._genesis_cache_root is not None:
+            for name in ('admin', 'genesis', 'owner1', 'owner2', 'owner3', '_fee_treasury'):
+                setattr(cls, name, create_address(data=f'{cls._genesis_seed}:{name}'.encode()))
+
+        cls.step_profiler: Optional[StepProfiler] = StepProfiler() if cls._profile_steps else None
+        cls.storage_tracer: Optional[StorageTracer] = StorageTracer() if cls._trace_storage else None
+        cls.query_cache: Optional[QueryCache] = QueryCache(cls._query_cache_size) if cls._cache_queries else None
+        cls.block_stream: Optional[BlockStream] = None
+        cls.memory_profiler: Optional[MemoryProfiler] = MemoryProfiler() if cls._profile_memory else None
+
+    @classmethod
+    def tearDownClass(cls):
+        rmtree(cls._test_root_path, ignore_errors=True)
+        clear_in_memory_db(cls._test_root_path)
+        cls._state_snapshot = None
+
     def setUp(self):
-        root_clear(self._score_root_path, self._state_db_root_path)
+        self._clear_roots()
+        if self.query_cache is not None:
+            # Every test restores the state, so results of the previous test at the same height are stale
+            self.query_cache.clear()
+        if self.storage_tracer is not None:
+            self.storage_tracer.start()
+            self.addCleanup(self.storage_tracer.stop)
+        if self.memory_profiler is not None:
+            self.memory_profiler.start()
+            self.addCleanup(self.memory_profiler.stop)
+
+        if self._state_snapshot is not None:
+            self._restore_state_snapshot()
+            return
 
         self._block_height = 0
         self._prev_block_hash = None
+        self.block_stream = BlockStream(self.admin) if self._record_blocks else None
+        self._setup_genesis()
+        attributes = self._prepare_state()
 
+        if self._use_state_snapshot:
+            self._take_state_snapshot(attributes)
+        self.__dict__.update(attributes)
+
+    def tearDown(self):
+        self.icon_service_engine.close()
+        self._clear_roots()
+
+    def _clear_roots(self):
+        root_clear(self._score_root_path, self._state_db_root_path)
+        clear_in_memory_db(self._state_db_root_path)
+
+    def _prepare_state(self) -> dict:
+        """Builds the state every test of the class starts from, on top of genesis
+
+        :return: attributes to set on each test (e.g. the addresses of deployed SCOREs)
+        """
+        return {}
+
+    def _take_state_snapshot(self, attributes: dict):
+        self.icon_service_engine.close()
+        copy_dir(self._score_root_path, os.path.join(self._snapshot_root_path, 'score'))
+        copy_dir(self._state_db_root_path, os.path.join(self._snapshot_root_path, 'statedb'))
+        copy_in_memory_db(self._state_db_root_path, os.path.join(self._snapshot_root_path, 'statedb'))
+        type(self)._state_snapshot = {
+            'attributes': attributes,
+            'block_height': self._block_height,
+            'prev_block_hash': self._prev_block_hash,
+            'block_stream': None if self.block_stream is None else self.block_stream.records
+        }
+        self._open_engine()
+
+    def _restore_state_snapshot(self):
+        copy_dir(os.path.join(self._snapshot_root_path, 'score'), self._score_root_path)
+        copy_dir(os.path.join(self._snapshot_root_path, 'statedb'), self._state_db_root_path)
+        copy_in_memory_db(os.path.join(self._snapshot_root_path, 'statedb'), self._state_db_root_path)
+        self._block_height = self._state_snapshot['block_height']
+        self._prev_block_hash = self._state_snapshot['prev_block_hash']
+        records = self._state_snapshot['block_stream']
+        self.block_stream = None if records is None else BlockStream(self.admin, records)
+        self._open_engine()
+        self.__dict__.update(self._state_snapshot['attributes'])
+
+    def _open_engine(self):
         config = IconConfig("", default_icon_config)
         config.load()
         config.update_conf({ConfigKey.BUILTIN_SCORE_OWNER: str(self.admin)})
@@ -71,20 +198,76 @@ class TestIntegrateBase(TestCase):
                                                 ConfigKey.SERVICE_SCORE_PACKAGE_VALIDATOR: False}})
         config.update_conf({ConfigKey.SCORE_ROOT_PATH: self._score_root_path,
                             ConfigKey.STATE_DB_ROOT_PATH: self._state_db_root_path})
+        # The reward calculator socket is named after AMQP_KEY
+        config.update_conf({ConfigKey.AMQP_KEY: os.path.basename(self._test_root_path)})
         config.update_conf(self._make_init_config())
 
         self.icon_service_engine = IconServiceEngine()
-        self.icon_service_engine.open(config)
-
-        self._genesis_invoke()
-
-    def tearDown(self):
-        self.icon_service_engine.close()
-        root_clear(self._score_root_path, self._state_db_root_path)
+        if self._use_in_memory_db:
+            with in_memory_state_db():
+                self.icon_service_engine.open(config)
+        else:
+            self.icon_service_engine.open(config)
 
     def _make_init_config(self) -> dict:
         return {}
 
+    def _setup_genesis(self):
+        """Opens the engine on the state right after genesis, restoring it from the genesis cache if possible"""
+        cache_path = self._get_genesis_cache_path()
+        if cache_path is not None:
+            meta = load_genesis_cache(cache_path, self._score_root_path, self._state_db_root_path)
+            if meta is not None:
+                self._block_height = meta['block_height']
+                self._prev_block_hash = bytes.fromhex(meta['prev_block_hash'])
+                self._open_engine()
+                return
+
+        self._open_engine()
+        self._genesis_invoke()
+        if self._revision is not None:
+            self._set_revision(self._revision)
+
+        if cache_path is not None:
+            self.icon_service_engine.close()
+            save_genesis_cache(cache_path, self._score_root_path, self._state_db_root_path,
+                               {'block_height': self._block_height, 'prev_block_hash': self._prev_block_hash.hex()})
+            self._open_engine()
+
+    def _get_genesis_cache_path(self) -> Optional[str]:
+        if self._genesis_cache_root is None or self._use_in_memory_db:
+            return None
+
+        try:
+            iconservice_version = version('iconservice')
+        except PackageNotFoundError:
+            iconservice_version = 'unknown'
+        extra = [iconservice_version, str(self.admin)]
+        if self._revision is not None:
+            extra.append(f'revision {self._revision}')
+        digest = genesis_digest(self._make_genesis_data_accounts(), *extra)
+        return os.path.join(self._genesis_cache_root, digest)
+
+    def _make_genesis_data_accounts(self) -> 'GenesisAccounts':
+        return GenesisAccounts({"name": "genesis", "address": self.genesis, "balance": 100 * self._icx_factor},
+                               {"name": "fee_treasury", "address": self._fee_treasury, "balance": 0},
+                               self._make_genesis_accounts)
+
+    def _make_genesis_accounts(self) -> Iterator[dict]:
+        """Yields the accounts funded at genesis other than the genesis account and the fee treasury"""
+        for name in ('owner1', 'owner2', 'owner3'):
+            yield {"name": name, "address": getattr(self, name), "balance": 100 * self._icx_factor}
+        if self._genesis_fixture is not None:
+            yield from load_genesis_accounts(self._genesis_fixture)
+        yield from generate_genesis_accounts(self._genesis_seed, self._genesis_account_count,
+                                             self._genesis_account_balance)
+
+    def genesis_senders(self) -> List['Address']:
+        """Returns the addresses of the _genesis_account_count accounts funded at genesis"""
+        return [account['address'] for account in generate_genesis_accounts(self._genesis_seed,
+                                                                           self._genesis_account_count,
+                                                                           self._genesis_account_balance)]
+
     def _genesis_invoke(self) -> list:
         tx_hash = create_tx_hash()
         timestamp_us = create_timestamp()
@@ -98,49 +281,28 @@ class TestIntegrateBase(TestCase):
             'method': 'icx_sendTransaction',
             'params': request_params,
             'genesisData': {
-                "accounts": [
-                    {
-                        "name": "genesis",
-                        "address": self.genesis,
-                        "balance": 100 * self._icx_factor
-                    },
-                    {
-                        "name": "fee_treasury",
-                        "address": self._fee_treasury,
-                        "balance": 0
-                    },
-                    {
-                        "name": "owner1",
-                        "address": self.owner1,
-                        "balance": 100 * self._icx_factor
-                    },
-                    {
-                        "name": "owner2",
-                        "address": self.owner2,
-                        "balance": 100 * self._icx_factor
-                    },
-                    {
-                        "name": "owner3",
-                        "address": self.owner3,
-                        "balance": 100 * self._icx_factor
-                    },
-                ]
+                "accounts": self._make_genesis_data_accounts()
             },
         }
 
         block_hash = create_block_hash()
         block = Block(self._block_height, block_hash, timestamp_us, None)
 
-        invoke_response, state_root_hash, added_transactions, next_preps = \
-            self.icon_service_engine.invoke(block=block,
-                                            tx_requests=[tx])
+        invoke_response = self._invoke_block(block, [tx])
 
-        self.icon_service_engine.commit(block.height, block.hash, None)
+        self._commit_block(block)
         self._block_height += 1
         self._prev_block_hash = block_hash
 
         return invoke_response
 
+    def _set_revision(self, revision: int):
+        """Updates the governance SCORE to tests/samples/governance, which has a revision code, and sets it"""
+        deploy_tx = self._make_deploy_tx("tests/samples", "governance", self.admin, GOVERNANCE_SCORE_ADDRESS)
+        revision_tx = self._make_score_call_tx(self.admin, GOVERNANCE_SCORE_ADDRESS, 'setRevision',
+                                               {'code': hex(revision)})
+        self.send_txs([deploy_tx, revision_tx])
+
     def deploy_score(self,
                      package_name: str,
                      deployer_address: 'Address',
@@ -177,9 +339,7 @@ class TestIntegrateBase(TestCase):
             deploy_data = {'contentType': 'application/tbears', 'content': score_path, 'params': deploy_params}
         else:
             if data is None:
-                mz = InMemoryZip()
-                mz.zip_in_memory(score_path)
-                data = f'0x{mz.data.hex()}'
+                data = zip_package(score_path, self._deploy_zip_compression)
             else:
                 data = f'0x{bytes.hex(data)}'
             deploy_data = {'contentType': 'application/zip', 'content': data, 'params': deploy_params}
@@ -238,6 +398,26 @@ class TestIntegrateBase(TestCase):
         self._write_precommit_state(prev_block)
         return tx_results[0]
 
+    def send_txs(self, tx_list: list, block_size: int = None) -> list:
+        """Invokes prepared transactions, block_size per block, committing each block once
+
+        :param tx_list: transactions made by _make_*_tx, possibly from different senders
+        :param block_size: the max number of transactions in a block. all in one block if None
+        :return: TransactionResults in the order of tx_list
+        """
+        if block_size is None:
+            block_size = max(len(tx_list), 1)
+
+        tx_results = []
+        for index in range(0, len(tx_list), block_size):
+            prev_block, block_tx_results = self._make_and_req_block(tx_list[index:index + block_size])
+            for tx_result in block_tx_results:
+                self.assertEqual(int(True), tx_result.status)
+
+            self._write_precommit_state(prev_block)
+            tx_results.extend(block_tx_results)
+        return tx_results
+
     def send_message(self,
                      addr_from: Optional['Address'],
                      addr_to: 'Address',
@@ -320,6 +500,58 @@ class TestIntegrateBase(TestCase):
         self.icon_service_engine.validate_transaction(tx)
         return tx
 
+    def invoke_competing_blocks(self, candidates: List[list], winner: int = 0) -> dict:
+        """Invokes tx lists as competing blocks on the same parent, commits one and removes the others
+
+        All candidates keep their precommit states side by side until the winner is chosen.
+        The losers are removed before the winner is committed, because a commit drops every other precommit state.
+
+        :param candidates: tx lists made by _make_*_tx, one per block
+        :param winner: the index of the candidate to commit
+        :return: 'tx_results' of the winner and per candidate 'invoke_ms', 'precommit_entries', 'precommit_bytes'
+            (the states held by the precommit data), 'committed' and 'finish_ms' (commit or remove time)
+        """
+        blocks = []
+        reports = []
+        winner_tx_results = None
+        for index, tx_list in enumerate(candidates):
+            start = perf_counter()
+            block, tx_results = self._make_and_req_block(tx_list)
+            invoke_ms = (perf_counter() - start) * 1000
+
+            precommit_entries, precommit_bytes = self._get_precommit_size(block.hash)
+            blocks.append(block)
+            reports.append({'invoke_ms': invoke_ms,
+                            'precommit_entries': precommit_entries,
+                            'precommit_bytes': precommit_bytes,
+                            'committed': index == winner})
+            if index == winner:
+                winner_tx_results = tx_results
+
+        for index, block in enumerate(blocks):
+            if index != winner:
+                start = perf_counter()
+                self._remove_precommit_state(block)
+                reports[index]['finish_ms'] = (perf_counter() - start) * 1000
+
+        start = perf_counter()
+        self._write_precommit_state(blocks[winner])
+        reports[winner]['finish_ms'] = (perf_counter() - start) * 1000
+
+        return {'tx_results': winner_tx_results, 'candidates': reports}
+
+    def _get_precommit_size(self, block_hash: bytes) -> tuple:
+        """Returns the number of the states changed by the precommit block and their size in bytes"""
+        precommit_data = self.icon_service_engine._precommit_data_manager.get(block_hash)
+        size = 0
+        for key, tx_batch_value in precommit_data.block_batch.items():
+            size += len(key) + (len(tx_batch_value.value) if tx_batch_value.value is not None else 0)
+        return len(precommit_data.block_batch), size
+
+    def _make_workload(self, seed: int) -> 'WorkloadGenerator':
+        """Returns a generator making transactions with the version, step limit and signature of this test"""
+        return WorkloadGenerator(seed, self._version, self._step_limit, self._signature)
+
     def icx_send_tx(self,
                     addr_from: Optional['Address'],
                     addr_to: Union['Address', 'MalformedAddress'],
@@ -376,21 +608,111 @@ class TestIntegrateBase(TestCase):
 
         block = Block(block_height, block_hash, timestamp_us, self._prev_block_hash)
 
-        tx_results, state_root_hash, added_transactions, next_preps = \
-            self.icon_service_engine.invoke(block=block,
-                                            tx_requests=tx_list)
+        if self.storage_tracer is not None:
+            for tx in tx_list:
+                self.storage_tracer.label_tx(tx['params']['txHash'], self._get_tx_method(tx))
+
+        tx_results = self._invoke_block(block, tx_list)
+
+        if self.step_profiler is not None:
+            for tx, tx_result in zip(tx_list, tx_results):
+                method = self._get_tx_method(tx)
+                self.step_profiler.record(method, self._step_input_size(method, tx['params']), tx_result.step_used)
         return block, tx_results
 
+    def _step_input_size(self, method: str, params: dict) -> int:
+        """Returns the input size that the step used by a transaction is recorded with
+
+        Defaults to the length of the call parameters or the message. Override it to profile
+        by another size, e.g. the length of the array a method appends to.
+
+        :param method: SCORE method, or the dataType ('transfer' if none) of other transactions
+        :param params: params of the transaction request
+        """
+        data = params.get('data')
+        if params.get('dataType') == 'call':
+            return sum(len(str(value)) for value in data.get('params', {}).values())
+        return len(data) if isinstance(data, str) else 0
+
+    @staticmethod
+    def _get_tx_method(tx: dict) -> str:
+        params = tx['params']
+        if params.get('dataType') == 'call':
+            return params['data']['method']
+        return params.get('dataType', 'transfer')
+
+    def _invoke_block(self, block: 'Block', tx_list: list) -> list:
+        with self._measure_memory('invoke'):
+            tx_results, state_root_hash, added_transactions, next_preps = \
+                self.icon_service_engine.invoke(block=block,
+                                                tx_requests=tx_list)
+
+        if self.block_stream is not None:
+            self.block_stream.add_invoke(block, tx_list, state_root_hash)
+        return tx_results
+
+    def _commit_block(self, block: 'Block'):
+        with self._measure_memory('commit'):
+            self.icon_service_engine.commit(block.height, block.hash, None)
+        if self.block_stream is not None:
+            self.block_stream.add_commit(block)
+
     def _write_precommit_state(self, block: 'Block') -> None:
-        self.icon_service_engine.commit(block.height, block.hash, None)
+        self._commit_block(block)
         self._block_height += 1
         self._prev_block_hash = block.hash
+        if self.query_cache is not None:
+            self.query_cache.clear()
 
     def _remove_precommit_state(self, block: 'Block') -> None:
-        self.icon_service_engine.rollback(block.height, block.hash)
+        self.icon_service_engine.remove_precommit_state(block.height, block.hash)
+        if self.block_stream is not None:
+            self.block_stream.add_remove_precommit(block)
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
+    def _measure_memory(self, operation: str):
+        if self.memory_profiler is None:
+            return nullcontext()
+        return self.memory_profiler.measure(operation)
+
+    def replay_blocks(self, stream: 'BlockStream') -> dict:
+        """Replaces the state with the result of replaying stream from genesis
+
+        The engine is reopened on empty roots with the admin of stream and left open on the replayed state.
+
+        :return: the report of replay_block_stream()
+        """
+        if getattr(self, 'icon_service_engine', None) is not None:
+            self.icon_service_engine.close()
+        self._clear_roots()
+        self.admin = stream.admin
+        self._open_engine()
+
+        report = replay_block_stream(self.icon_service_engine, stream)
+        if report['last_block'] is not None:
+            self._block_height = report['last_block'][0] + 1
+            self._prev_block_hash = report['last_block'][1]
+        if self.query_cache is not None:
+            self.query_cache.clear()
+        return report
 
     def _query(self, request: dict, method: str = 'icx_call') -> Any:
-        response = self.icon_service_engine.query(method, request)
+        if self.query_cache is not None:
+            key = QueryCache.make_key(self._block_height, method, request)
+            hit, response = self.query_cache.get(key)
+            if hit:
+                return response
+
+        data = request.get('data')
+        query_method = data.get('method') if isinstance(data, dict) else method
+        if self.storage_tracer is not None:
+            self.storage_tracer.set_query(query_method)
+
+        with self._measure_memory(f'query.{query_method}'):
+            response = self.icon_service_engine.query(method, request)
+        if self.query_cache is not None:
+            self.query_cache.put(key, response)
         return response
 
     def _create_invalid_block(self, block_height: int = None) -> 'Block':
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from typing import List
 
 from iconservice.iconscore.icon_score_result import TransactionResult
@@ -8,12 +10,12 @@ from iconservice import *
 
 
 class TestHello(TestIntegrateBase):
-    def setUp(self):
-        super().setUp()
+    def _prepare_state(self) -> dict:
         # SCORE Owner 생성
-        self.score_owner: 'Address' = create_address()
+        score_owner: 'Address' = create_address()
         # Deploy SCORE. parameter로 SCORE의 package name, SCORE Owner 전달
-        self.score_address = self.deploy_score("hello", self.score_owner)
+        score_address = self.deploy_score("hello", score_owner)
+        return {"score_owner": score_owner, "score_address": score_address}
 
     def test_var_db(self):
         expected_value = "test"
@@ -29,7 +31,7 @@ class TestHello(TestIntegrateBase):
         actual_value = self.query(self.score_address, 'getVar')
 
         self.assertEqual(expected_value, actual_value)
-        self.assertEqual(tx_result.event_logs[0].data[0], expected_value)
+        self.assertEqual(tx_result.event_logs[0].indexed[1], expected_value)
 
     def test_dict_db(self):
         tx_result: 'TransactionResult' = self.send_tx(self.score_owner,
@@ -39,6 +41,26 @@ class TestHello(TestIntegrateBase):
 
         actual_value = self.query(self.score_address, 'getDict', {"key": "test"})
         self.assertEqual("0x1", actual_value)
+        self.assertEqual(['SetDict(str,str)', "test", "0x1"], tx_result.event_logs[0].indexed)
+
+    def test_large_value_eventlog(self):
+        large_value = "x" * 257
+        large_value_hash = hashlib.sha3_256(large_value.encode()).digest()
+
+        tx_result = self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": large_value})
+        self.assertEqual(['SetVarHashed(bytes,str)', large_value_hash], tx_result.event_logs[0].indexed)
+        self.assertEqual([large_value], tx_result.event_logs[0].data)
+
+        tx_result = self.send_tx(self.score_owner, self.score_address, 'setDict',
+                                 {"key": "small", "value": large_value})
+        self.assertEqual(['SetDictHashed(bytes,bytes,str,str)', hashlib.sha3_256(b"small").digest(),
+                          large_value_hash], tx_result.event_logs[0].indexed)
+        self.assertEqual(["small", large_value], tx_result.event_logs[0].data)
+
+        tx_result = self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch',
+                                 {"data": json.dumps(["small", large_value])})
+        self.assertEqual(['AppendArray(str)', "small"], tx_result.event_logs[0].indexed)
+        self.assertEqual(['AppendArrayHashed(bytes,str)', large_value_hash], tx_result.event_logs[1].indexed)
 
     def test_msg(self):
         # message call의 경우 hex string으로 변환해야 하며 'string_to_hex_string' method를 통해 변환 가능
@@ -46,3 +68,217 @@ class TestHello(TestIntegrateBase):
         tx_result = self.send_message(self.score_owner,
                                       self.owner1,
                                       hex_data)
+
+    def test_array_range(self):
+        for index in range(5):
+            self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": str(index)})
+
+        self.assertEqual(5, self.query(self.score_address, 'getArrayLength'))
+        self.assertEqual(["1", "2"], self.query(self.score_address, 'getArrayRange',
+                                                {"offset": hex(1), "limit": hex(2)}))
+        self.assertEqual(["3", "4"], self.query(self.score_address, 'getArrayRange',
+                                                {"offset": hex(3), "limit": hex(10)}))
+        self.assertEqual([], self.query(self.score_address, 'getArrayRange', {"offset": hex(7)}))
+        self.assertEqual(["4", "3"], self.query(self.score_address, 'getArrayLatest', {"count": hex(2)}))
+        self.assertEqual(["4", "3", "2", "1", "0"], self.query(self.score_address, 'getArrayLatest'))
+
+    def test_batch_write(self):
+        tx_result = self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch',
+                                 {"data": '["a","b","c"]'})
+        self.assertEqual(3, len(tx_result.event_logs))
+        self.assertEqual(["a", "b", "c"], self.query(self.score_address, 'getArray'))
+
+        tx_result = self.send_tx(self.score_owner, self.score_address, 'setDictBatch',
+                                 {"entries": '{"k1":"v1","k2":"v2"}', "summary": "0x1"})
+        self.assertEqual(1, len(tx_result.event_logs))
+        self.assertEqual(2, tx_result.event_logs[0].data[0])
+        self.assertEqual("v2", self.query(self.score_address, 'getDict', {"key": "k2"}))
+
+    def test_batch_write_too_large(self):
+        data = json.dumps([str(index) for index in range(101)])
+        tx = self._make_score_call_tx(self.score_owner, self.score_address, 'appendArrayBatch', {"data": data})
+        prev_block, tx_results = self._make_and_req_block([tx])
+        self._write_precommit_state(prev_block)
+
+        self.assertEqual(int(False), tx_results[0].status)
+        self.assertEqual(0, self.query(self.score_address, 'getArrayLength'))
+
+    def test_dict_many(self):
+        self.send_tx(self.score_owner, self.score_address, 'setDictBatch',
+                     {"entries": '{"k1":"v1","k2":"v2"}'})
+
+        actual_value = self.query(self.score_address, 'getDictMany', {"keys": '["k1","k2","k3"]'})
+        self.assertEqual({"values": {"k1": "v1", "k2": "v2"}, "missing": ["k3"]}, actual_value)
+
+    def test_dict_keys(self):
+        self.send_tx(self.score_owner, self.score_address, 'setDictBatch',
+                     {"entries": '{"a1":"1","b1":"2","a2":"3"}'})
+        self.send_tx(self.score_owner, self.score_address, 'setDict', {"key": "a1", "value": "4"})
+
+        self.assertEqual(["a1", "b1", "a2"], self.query(self.score_address, 'getDictKeys'))
+        self.assertEqual(["b1"], self.query(self.score_address, 'getDictKeys',
+                                            {"offset": hex(1), "limit": hex(1)}))
+
+        actual_value = self.query(self.score_address, 'getDictKeysWithPrefix', {"prefix": "a", "limit": hex(1)})
+        self.assertEqual({"keys": ["a1"], "next": 1}, actual_value)
+        actual_value = self.query(self.score_address, 'getDictKeysWithPrefix', {"prefix": "a", "offset": hex(1)})
+        self.assertEqual({"keys": ["a2"], "next": -1}, actual_value)
+
+    def test_dict_keys_after_removed_block(self):
+        tx = self._make_score_call_tx(self.score_owner, self.score_address, 'setDict', {"key": "dropped", "value": "1"})
+        prev_block, _ = self._make_and_req_block([tx])
+        self._remove_precommit_state(prev_block)
+        self.send_tx(self.score_owner, self.score_address, 'setDict', {"key": "a", "value": "2"})
+
+        self.assertEqual(["a"], self.query(self.score_address, 'getDictKeys'))
+        self.assertEqual(1, self.query(self.score_address, 'getDictSize'))
+
+    def test_array_membership(self):
+        self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch', {"data": '["a","b","a","c"]'})
+
+        self.assertTrue(self.query(self.score_address, 'containsArray', {"data": "b"}))
+        self.assertFalse(self.query(self.score_address, 'containsArray', {"data": "d"}))
+        self.assertEqual(-1, self.query(self.score_address, 'indexOfArray', {"data": "d"}))
+
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": "a"})
+        self.assertEqual(["a", "b", "c"], self.query(self.score_address, 'getArray'))
+        self.assertEqual(0, self.query(self.score_address, 'indexOfArray', {"data": "a"}))
+
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": "a"})
+        self.assertEqual(["c", "b"], self.query(self.score_address, 'getArray'))
+        self.assertFalse(self.query(self.score_address, 'containsArray', {"data": "a"}))
+        self.assertEqual(0, self.query(self.score_address, 'indexOfArray', {"data": "c"}))
+
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": "b"})
+        self.assertEqual(["c"], self.query(self.score_address, 'getArray'))
+
+    def test_array_across_buckets(self):
+        items = [str(index) for index in range(40)]
+        self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch', {"data": json.dumps(items[:10])})
+        self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch', {"data": json.dumps(items[10:])})
+
+        self.assertEqual(items, self.query(self.score_address, 'getArray'))
+        self.assertEqual(items[14:19], self.query(self.score_address, 'getArrayRange',
+                                                  {"offset": hex(14), "limit": hex(5)}))
+        self.assertEqual(items[:-4:-1], self.query(self.score_address, 'getArrayLatest', {"count": hex(3)}))
+
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": "3"})
+        items[3] = items.pop()
+        self.assertEqual(items, self.query(self.score_address, 'getArray'))
+        self.assertEqual(3, self.query(self.score_address, 'indexOfArray', {"data": "39"}))
+
+    def test_large_array_items(self):
+        large_items = [str(index) * 300 for index in range(3)]
+        self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch',
+                     {"data": json.dumps(["a", large_items[0], "b", large_items[1]])})
+        self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": large_items[2]})
+
+        items = ["a", large_items[0], "b", large_items[1], large_items[2]]
+        self.assertEqual(items, self.query(self.score_address, 'getArray'))
+        self.assertEqual(items[1:3], self.query(self.score_address, 'getArrayRange',
+                                                {"offset": hex(1), "limit": hex(2)}))
+
+        # The last item moves into the position of the removed one
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": "a"})
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": large_items[0]})
+        self.assertEqual([large_items[2], large_items[1], "b"], self.query(self.score_address, 'getArray'))
+        self.assertEqual(2, self.query(self.score_address, 'indexOfArray', {"data": "b"}))
+
+    def test_aggregates(self):
+        self.assertEqual({"length": 0, "distinct": 0}, self.query(self.score_address, 'getArrayStats'))
+        self.assertEqual(0, self.query(self.score_address, 'getDictSize'))
+
+        self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch', {"data": '["a","b","a"]'})
+        self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "a"})
+        self.send_tx(self.score_owner, self.score_address, 'setDictBatch', {"entries": '{"x":"1","y":"2"}'})
+        self.send_tx(self.score_owner, self.score_address, 'setDict', {"key": "x", "value": "3"})
+
+        self.assertEqual({"length": 4, "distinct": 2}, self.query(self.score_address, 'getArrayStats'))
+        self.assertEqual(3, self.query(self.score_address, 'countArray', {"data": "a"}))
+        self.assertEqual(0, self.query(self.score_address, 'countArray', {"data": "c"}))
+        self.assertEqual(2, self.query(self.score_address, 'getDictSize'))
+
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": "b"})
+        self.assertEqual({"length": 3, "distinct": 1}, self.query(self.score_address, 'getArrayStats'))
+        self.assertEqual(0, self.query(self.score_address, 'countArray', {"data": "b"}))
+
+    def test_var_history(self):
+        first_result = self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "first"})
+        second_result = self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "second"})
+
+        def get_var_at(height: int) -> str:
+            return self.query(self.score_address, 'getVarAt', {"height": hex(height)})
+
+        self.assertEqual("", get_var_at(first_result.block_height - 1))
+        self.assertEqual("first", get_var_at(first_result.block_height))
+        self.assertEqual("second", get_var_at(second_result.block_height))
+        self.assertEqual("second", get_var_at(second_result.block_height + 100))
+
+    def test_chunked_var_history(self):
+        large_value = "0123456789" * 250
+        plain_result = self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "plain"})
+        chunked_result = self.send_tx(self.score_owner, self.score_address, 'setVar',
+                                      {"data": large_value, "chunked": "0x1"})
+
+        def get_var_info_at(height: int) -> dict:
+            return self.query(self.score_address, 'getVarInfoAt', {"height": hex(height)})
+
+        self.assertEqual("plain", self.query(self.score_address, 'getVarAt',
+                                             {"height": hex(plain_result.block_height)}))
+        self.assertEqual({"chunked": False, "size": 5, "checksum": hashlib.sha3_256(b"plain").digest()},
+                         get_var_info_at(plain_result.block_height))
+
+        # Only the size and checksum of the chunked value are kept in the history
+        info = get_var_info_at(chunked_result.block_height)
+        self.assertEqual({"chunked": True, "size": len(large_value),
+                          "checksum": hashlib.sha3_256(large_value.encode()).digest()}, info)
+        self.assertEqual(self.query(self.score_address, 'getVarInfo')["checksum"], info["checksum"])
+        with self.assertRaises(IconScoreException):
+            self.query(self.score_address, 'getVarAt', {"height": hex(chunked_result.block_height)})
+
+    def test_chunked_value(self):
+        expected_value = "0123456789" * 250
+        expected_hash = hashlib.sha3_256(expected_value.encode()).digest()
+        tx_result = self.send_tx(self.score_owner, self.score_address, 'setVar',
+                                 {"data": expected_value, "chunked": "0x1"})
+        # The log of a chunked value has its hash, size and chunk count instead of the value
+        self.assertEqual(['SetVarChunked(bytes,int,int)', expected_hash], tx_result.event_logs[0].indexed)
+        self.assertEqual([len(expected_value), 3], tx_result.event_logs[0].data)
+
+        self.assertEqual(expected_value, self.query(self.score_address, 'getVar'))
+        info = self.query(self.score_address, 'getVarInfo')
+        self.assertEqual(len(expected_value), info["size"])
+        self.assertEqual(3, info["chunks"])
+        self.assertEqual(expected_value[1024:2048].encode(),
+                         self.query(self.score_address, 'getVarChunk', {"index": hex(1)}))
+        self.assertEqual(expected_value[1020:1030].encode(),
+                         self.query(self.score_address, 'getVarRange', {"offset": hex(1020), "length": hex(10)}))
+
+        tx_result = self.send_tx(self.score_owner, self.score_address, 'setDict',
+                                 {"key": "big", "value": expected_value, "chunked": "0x1"})
+        self.assertEqual(['SetDictChunked(bytes,bytes,str,int,int)', hashlib.sha3_256(b"big").digest(),
+                          expected_hash], tx_result.event_logs[0].indexed)
+        self.assertEqual(["big", len(expected_value), 3], tx_result.event_logs[0].data)
+        self.assertEqual(expected_value, self.query(self.score_address, 'getDict', {"key": "big"}))
+        self.assertEqual(expected_value[2040:].encode(),
+                         self.query(self.score_address, 'getDictRange',
+                                    {"key": "big", "offset": hex(2040), "length": hex(1000)}))
+
+        self.send_tx(self.score_owner, self.score_address, 'setDict', {"key": "big", "value": "small"})
+        self.assertEqual("small", self.query(self.score_address, 'getDict', {"key": "big"}))
+
+    def test_multi_tx_block(self):
+        tx_list = [self._make_score_call_tx(sender, self.score_address, 'appendArray', {"data": str(index)})
+                   for index, sender in enumerate([self.owner1, self.owner2, self.owner3])]
+        block_height = self._block_height
+
+        tx_results = self.send_txs(tx_list, block_size=2)
+
+        self.assertEqual(3, len(tx_results))
+        self.assertEqual([block_height, block_height, block_height + 1],
+                         [tx_result.block_height for tx_result in tx_results])
+        self.assertEqual(["0", "1", "2"], self.query(self.score_address, 'getArray'))
+
+
+class TestHelloInMemory(TestHello):
+    _use_in_memory_db = True
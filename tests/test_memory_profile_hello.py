@@ -0,0 +1,52 @@
+import json
+import os
+
+from tests.hello_test_base import HelloTestBase
+from iconservice import *
+
+# Writes the peak and retained bytes per operation and size as JSON to this path if set
+MEMORY_REPORT_PATH = os.environ.get('HELLO_MEMORY_REPORT')
+# JSON objects of operation -> bytes overriding the default ceilings
+MAX_PEAK = {'query.getArrayRange': 512 * 1024, 'query.getDict': 512 * 1024,
+            **json.loads(os.environ.get('HELLO_MEMORY_MAX_PEAK', '{}'))}
+MAX_RETAINED = {'query.getArrayRange': 64 * 1024, **json.loads(os.environ.get('HELLO_MEMORY_MAX_RETAINED', '{}'))}
+
+SIZES = (100, 500, 1000)
+BATCH_SIZE = 100
+
+
+class TestMemoryProfileHello(HelloTestBase):
+    _profile_memory = True
+
+    def _grow_state(self, stored_size: int, size: int):
+        tx_list = []
+        for start in range(stored_size, size, BATCH_SIZE):
+            indexes = range(start, min(start + BATCH_SIZE, size))
+            tx_list.append(self._make_score_call_tx(self.score_owner, self.score_address, 'appendArrayBatch',
+                                                    {"data": json.dumps([f'item{index}' for index in indexes]),
+                                                     "summary": "0x1"}))
+            tx_list.append(self._make_score_call_tx(self.score_owner, self.score_address, 'setDictBatch',
+                                                    {"entries": json.dumps({str(index): 'v' for index in indexes}),
+                                                     "summary": "0x1"}))
+        self.send_txs(tx_list)
+
+    def test_memory_growth(self):
+        stored_size = 0
+        for size in SIZES:
+            self._grow_state(stored_size, size)
+            stored_size = size
+            self.memory_profiler.size = size
+
+            self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "item"})
+            self.query(self.score_address, 'getArray')
+            self.query(self.score_address, 'getArrayRange', {"limit": hex(10)})
+            self.query(self.score_address, 'getDict', {"key": "0"})
+
+        if MEMORY_REPORT_PATH:
+            self.memory_profiler.write(MEMORY_REPORT_PATH)
+
+        # getArray builds the whole array in memory while a page does not grow with the array
+        get_array = self.memory_profiler.curve('query.getArray')
+        self.assertGreater(get_array[-1][1], get_array[0][1])
+        violations = self.memory_profiler.check(MAX_PEAK, MAX_RETAINED)
+        self.assertEqual([], violations)
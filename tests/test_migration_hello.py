@@ -0,0 +1,119 @@
+from tests import create_address
+from tests.test_integrate_base import TestIntegrateBase
+from iconservice import *
+
+
+class TestMigrationHello(TestIntegrateBase):
+    """Updates hello from tests/samples/hello_v0, the version before the storage version was kept"""
+
+    def _prepare_state(self) -> dict:
+        score_owner: 'Address' = create_address()
+        score_address = self._deploy_v0(score_owner)
+        return {"score_owner": score_owner, "score_address": score_address}
+
+    def _deploy_v0(self, score_owner: 'Address') -> 'Address':
+        tx = self._make_deploy_tx("tests/samples", "hello_v0", score_owner, ZERO_SCORE_ADDRESS)
+        return self.send_txs([tx])[0].score_address
+
+    def _append_v0(self, score_address: 'Address', items: list):
+        self.send_txs([self._make_score_call_tx(self.score_owner, score_address, 'appendArray', {"data": item})
+                       for item in items])
+
+    def _update(self, score_address: 'Address' = None):
+        tx = self._make_deploy_tx("", "hello", self.score_owner, score_address or self.score_address)
+        return self.send_txs([tx])[0]
+
+    def _migrate(self, count: int = None):
+        params = {} if count is None else {"count": hex(count)}
+        self.send_tx(self.score_owner, self.score_address, 'migrateArray', params)
+        return self.query(self.score_address, 'getArrayMigrationLeft')
+
+    def test_update(self):
+        items = ["a", "b", "a"] + [str(index) for index in range(20)]
+        self._append_v0(self.score_address, items)
+        self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "before"})
+        self.send_tx(self.score_owner, self.score_address, 'setDict', {"key": "k", "value": "v"})
+
+        update_result = self._update()
+
+        # The items are read in place until migrated
+        self.assertEqual(len(items), self.query(self.score_address, 'getArrayMigrationLeft'))
+        self.assertEqual(items, self.query(self.score_address, 'getArray'))
+        self.assertEqual(len(items), self.query(self.score_address, 'getArrayLength'))
+        self.assertEqual(["1", "2"], self.query(self.score_address, 'getArrayRange',
+                                                {"offset": hex(4), "limit": hex(2)}))
+        with self.assertRaises(IconScoreException):
+            self.query(self.score_address, 'countArray', {"data": "a"})
+
+        # Items move a bucket at a time from the end
+        self.assertEqual(16, self._migrate(1))
+        self.assertEqual(0, self._migrate())
+
+        self.assertEqual(items, self.query(self.score_address, 'getArray'))
+        self.assertEqual(["1", "2"], self.query(self.score_address, 'getArrayRange',
+                                                {"offset": hex(4), "limit": hex(2)}))
+        self.assertEqual(2, self.query(self.score_address, 'countArray', {"data": "a"}))
+        self.assertIn(self.query(self.score_address, 'indexOfArray', {"data": "a"}), (0, 2))
+        self.assertEqual(1, self.query(self.score_address, 'indexOfArray', {"data": "b"}))
+        self.assertEqual({"length": len(items), "distinct": 22}, self.query(self.score_address, 'getArrayStats'))
+
+        # The history starts at the update
+        self.assertEqual("", self.query(self.score_address, 'getVarAt',
+                                        {"height": hex(update_result.block_height - 1)}))
+        self.assertEqual("before", self.query(self.score_address, 'getVarAt',
+                                              {"height": hex(update_result.block_height)}))
+        self.assertEqual("v", self.query(self.score_address, 'getDict', {"key": "k"}))
+
+        # Keys set before the update are not in the key index until they are set again
+        self.assertEqual(0, self.query(self.score_address, 'getDictSize'))
+        self.send_tx(self.score_owner, self.score_address, 'setDict', {"key": "k", "value": "w"})
+        self.assertEqual(["k"], self.query(self.score_address, 'getDictKeys'))
+        self.assertEqual(1, self.query(self.score_address, 'getDictSize'))
+
+    def test_write_during_migration(self):
+        items = [str(index) for index in range(20)]
+        self._append_v0(self.score_address, items)
+        self._update()
+
+        # The append writes the last bucket, which still holds legacy items
+        self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch', {"data": '["a","0"]'})
+        tx = self._make_score_call_tx(self.score_owner, self.score_address, 'removeArray', {"data": "a"})
+        prev_block, tx_results = self._make_and_req_block([tx])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(int(False), tx_results[0].status)
+
+        self.assertEqual(0, self._migrate(100))
+        self.assertEqual(items + ["a", "0"], self.query(self.score_address, 'getArray'))
+        self.assertEqual(2, self.query(self.score_address, 'countArray', {"data": "0"}))
+        self.assertEqual({"length": 22, "distinct": 21}, self.query(self.score_address, 'getArrayStats'))
+
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": "a"})
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": "0"})
+        self.assertEqual(20, self.query(self.score_address, 'getArrayLength'))
+        self.assertEqual(1, self.query(self.score_address, 'countArray', {"data": "0"}))
+        self.assertEqual({"length": 20, "distinct": 20}, self.query(self.score_address, 'getArrayStats'))
+
+    def test_write_after_update(self):
+        self._append_v0(self.score_address, ["a"])
+        self._update()
+        self._migrate()
+
+        self.send_tx(self.score_owner, self.score_address, 'removeArray', {"data": "a"})
+        self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch', {"data": '["b","c"]'})
+        set_var_result = self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "after"})
+
+        self.assertEqual(["b", "c"], self.query(self.score_address, 'getArray'))
+        self.assertEqual(-1, self.query(self.score_address, 'indexOfArray', {"data": "a"}))
+        self.assertEqual({"length": 2, "distinct": 2}, self.query(self.score_address, 'getArrayStats'))
+        self.assertEqual("after", self.query(self.score_address, 'getVarAt',
+                                             {"height": hex(set_var_result.block_height)}))
+
+    def test_update_step_used(self):
+        large_score_address = self._deploy_v0(self.score_owner)
+        self._append_v0(self.score_address, ["a"])
+        self._append_v0(large_score_address, [str(index) for index in range(200)])
+
+        small_step_used = self._update().step_used
+        large_step_used = self._update(large_score_address).step_used
+        # on_update leaves the work per item to migrateArray; only the stored lengths take a byte more
+        self.assertLess(large_step_used - small_step_used, 1000)
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from tests import create_address
+from tests.query_cache import QueryCache
+from tests.hello_test_base import HelloTestBase
+from iconservice import *
+
+
+class TestQueryCache(TestCase):
+
+    def test_lru_eviction(self):
+        cache = QueryCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual((True, 1), cache.get('a'))
+        self.assertEqual((False, None), cache.get('b'))
+        self.assertEqual({'hits': 2, 'misses': 1, 'evictions': 1, 'size': 2, 'hit_ratio': 2 / 3}, cache.stats())
+
+    def test_copy_results(self):
+        cache = QueryCache()
+        result = ["a"]
+        cache.put('a', result)
+        result.append("b")
+        cache.get('a')[1].append("c")
+
+        self.assertEqual((True, ["a"]), cache.get('a'))
+
+    def test_key(self):
+        address = create_address()
+        self.assertEqual(QueryCache.make_key(1, 'icx_call', {"to": address, "data": {"a": 1, "b": 2}}),
+                         QueryCache.make_key(1, 'icx_call', {"data": {"b": 2, "a": 1}, "to": address}))
+        self.assertNotEqual(QueryCache.make_key(1, 'icx_call', {"to": address}),
+                            QueryCache.make_key(2, 'icx_call', {"to": address}))
+
+
+class TestQueryCacheHello(HelloTestBase):
+    _cache_queries = True
+
+    def test_invalidate_on_commit(self):
+        self.query(self.score_address, 'getVar')
+        hits = self.query_cache.hits
+        self.assertEqual("", self.query(self.score_address, 'getVar'))
+        self.assertEqual(hits + 1, self.query_cache.hits)
+
+        self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "new"})
+
+        self.assertEqual("new", self.query(self.score_address, 'getVar'))
+        self.assertEqual(hits + 1, self.query_cache.hits)
+
+    def test_invalidate_on_remove_precommit(self):
+        self.query(self.score_address, 'getArrayLength')
+        tx = self._make_score_call_tx(self.score_owner, self.score_address, 'appendArray', {"data": "a"})
+        prev_block, _ = self._make_and_req_block([tx])
+        self._remove_precommit_state(prev_block)
+
+        self.assertEqual(0, len(self.query_cache))
+        self.assertEqual(0, self.query(self.score_address, 'getArrayLength'))
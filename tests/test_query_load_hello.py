@@ -0,0 +1,39 @@
+from tests.query_load import QueryLoadDriver
+from tests.hello_test_base import HelloTestBase
+from iconservice import *
+
+QUERY_COUNT = 200
+WORKERS = 4
+
+
+class TestQueryLoadHello(HelloTestBase):
+
+    def setUp(self):
+        super().setUp()
+        self.send_tx(self.score_owner, self.score_address, 'setVar', {"data": "var"})
+        self.send_tx(self.score_owner, self.score_address, 'setDict', {"key": "key", "value": "value"})
+        self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "item"})
+        self.driver = QueryLoadDriver(self, [(self.score_address, 'hello', None),
+                                             (self.score_address, 'getVar', None),
+                                             (self.score_address, 'getDict', {"key": "key"}),
+                                             (self.score_address, 'getArray', None)], WORKERS)
+
+    def test_concurrent_queries(self):
+        report = self.driver.run(QUERY_COUNT)
+
+        self.assertEqual(QUERY_COUNT, report['queries'])
+        self.assertEqual(0, report['errors'], report['error_types'])
+        self.assertEqual(0, report['blocks'])
+        self.assertLessEqual(report['p50'], report['p99'])
+
+    def test_concurrent_queries_while_writing(self):
+        def write():
+            self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "item"})
+
+        report = self.driver.run(QUERY_COUNT, write)
+
+        self.assertEqual(0, report['errors'], report['error_types'])
+        self.assertIsNone(report['writer_error'])
+        self.assertGreaterEqual(report['blocks'], 1)
+        length = self.query(self.score_address, 'getArrayLength')
+        self.assertEqual(1 + report['blocks'], length)
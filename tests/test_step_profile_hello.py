@@ -0,0 +1,50 @@
+import os
+
+from hello.packed_array import BUCKET_SIZE, MAX_INLINE_SIZE
+from tests.hello_test_base import HelloTestBase
+from iconservice import *
+
+# Writes the cost curves as JSON to this path if set
+STEP_REPORT_PATH = os.environ.get('HELLO_STEP_REPORT')
+LARGE_ITEM_SIZE = 20_000
+
+
+class TestStepProfileHello(HelloTestBase):
+    _profile_steps = True
+
+    def _step_input_size(self, method: str, params: dict) -> int:
+        if method == 'appendArray':
+            # An append writes the new item and rewrites the bucket of the last items,
+            # leaving out those over MAX_INLINE_SIZE bytes, so the cost follows those bytes.
+            # The block is not committed yet, so this is the bucket before the append
+            length = self.query(self.score_address, 'getArrayLength')
+            items = self.query(self.score_address, 'getArrayRange',
+                               {"offset": hex(length - length % BUCKET_SIZE), "limit": hex(BUCKET_SIZE)})
+            sizes = [len(item.encode()) for item in items + [params['data']['params']['data']]]
+            return sum(size for size in sizes[:-1] if size <= MAX_INLINE_SIZE) + sizes[-1]
+        return super()._step_input_size(method, params)
+
+    def test_step_cost(self):
+        for _ in range(BUCKET_SIZE * 4):
+            self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "item"})
+        for length in (1, 10, 100, 1000):
+            self.send_tx(self.score_owner, self.score_address, 'setDict', {"key": "key", "value": "v" * length})
+
+        if STEP_REPORT_PATH:
+            self.step_profiler.write(STEP_REPORT_PATH)
+
+        # appendArray pays for the bytes of the bucket it rewrites.
+        # setDict pays for the input, the stored value and the eventlog per byte of value.
+        violations = self.step_profiler.check(max_growth={'appendArray': 200, 'setDict': 600})
+        self.assertEqual([], violations)
+
+    def test_step_cost_after_large_items(self):
+        first_result = self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "a"})
+        for _ in range(BUCKET_SIZE - 2):
+            self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "x" * LARGE_ITEM_SIZE})
+        last_result = self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "b"})
+
+        # The large items in the bucket are not rewritten
+        self.assertEqual([(1, first_result.step_used), (2, last_result.step_used)],
+                         self.step_profiler.cost_curve('appendArray')[:2])
+        self.assertLess(last_result.step_used, first_result.step_used * 2)
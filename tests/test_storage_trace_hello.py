@@ -0,0 +1,43 @@
+import json
+
+from hello.packed_array import BUCKET_SIZE, MAX_INLINE_SIZE
+from tests.hello_test_base import HelloTestBase
+from iconservice import *
+
+
+class TestStorageTraceHello(HelloTestBase):
+    _trace_storage = True
+
+    def test_array_read_io(self):
+        self.send_tx(self.score_owner, self.score_address, 'appendArrayBatch',
+                     {"data": json.dumps([str(index) for index in range(BUCKET_SIZE * 2 + 1)])})
+        self.storage_tracer.reset()
+
+        self.query(self.score_address, 'getArray')
+        self.query(self.score_address, 'getArrayRange', {"limit": hex(2)})
+
+        report = self.storage_tracer.report()
+        self.assertEqual(1, report['getArray']['calls'])
+        # getArray reads every bucket once while getArrayRange reads only the bucket of the page
+        self.assertEqual(3, report['getArray']['array_db_buckets']['get'])
+        self.assertEqual(1, report['getArrayRange']['array_db_buckets']['get'])
+        self.assertNotIn('put', report['getArray']['array_db_buckets'])
+
+    def test_append_io(self):
+        self.storage_tracer.reset()
+        self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "a"})
+
+        report = self.storage_tracer.report()
+        # The bucket and the length of the array
+        self.assertEqual(1, report['appendArray']['array_db_buckets']['put'])
+        self.assertEqual(1, report['appendArray']['array_db_length']['put'])
+
+    def test_append_after_large_item_io(self):
+        self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "x" * (MAX_INLINE_SIZE + 1)})
+        self.storage_tracer.reset()
+        self.send_tx(self.score_owner, self.score_address, 'appendArray', {"data": "a"})
+
+        report = self.storage_tracer.report()
+        # The large item has an entry of its own, which the append neither reads nor writes
+        self.assertEqual(1, report['appendArray']['array_db_buckets']['put'])
+        self.assertNotIn('array_db_items', report['appendArray'])
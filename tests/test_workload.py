@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+from tests.hello_test_base import HelloTestBase
+from tests.workload import WorkloadGenerator
+from iconservice import *
+
+TX_COUNT = 100
+
+
+class TestWorkloadGenerator(TestCase):
+
+    def _make_workload(self, seed: int) -> list:
+        workload = WorkloadGenerator(seed)
+        senders = workload.addresses(10)
+        score_address = workload.address(AddressPrefix.CONTRACT)
+        template = workload.call_template(None, score_address, 'setDict')
+        return workload.make_txs(template, TX_COUNT, senders, lambda index: {"key": str(index), "value": "v"})
+
+    def test_same_seed(self):
+        self.assertEqual(self._make_workload(1), self._make_workload(1))
+
+    def test_different_seed(self):
+        self.assertNotEqual(self._make_workload(1), self._make_workload(2))
+
+    def test_make_txs(self):
+        tx_list = self._make_workload(1)
+
+        self.assertEqual(TX_COUNT, len(tx_list))
+        self.assertEqual(TX_COUNT, len({tx['params']['txHash'] for tx in tx_list}))
+        self.assertEqual(TX_COUNT, len({tx['params']['timestamp'] for tx in tx_list}))
+        self.assertEqual(10, len({tx['params']['from'] for tx in tx_list}))
+        self.assertEqual({"key": "3", "value": "v"}, tx_list[3]['params']['data']['params'])
+        self.assertEqual('setDict', tx_list[3]['params']['data']['method'])
+
+    def test_make_txs_without_params(self):
+        workload = WorkloadGenerator(1)
+        template = workload.call_template(None, workload.address(AddressPrefix.CONTRACT), 'setVar', {"data": "v"})
+        tx_list = workload.make_txs(template, 2)
+
+        tx_list[0]['params']['data']['params']['data'] = "changed"
+        self.assertEqual({"data": "v"}, tx_list[1]['params']['data']['params'])
+        self.assertEqual({"data": "v"}, template['data']['params'])
+
+    def test_validate_keeps_workload(self):
+        validated = []
+
+        class Engine:
+            @staticmethod
+            def validate_transaction(tx: dict):
+                validated.append(tx)
+
+        workload = WorkloadGenerator(1)
+        other = WorkloadGenerator(1)
+        template = workload.transfer_template(workload.address(), other.address(), 1)
+        workload.validate(Engine, workload.make_txs(template, TX_COUNT), sample_size=10)
+        other.make_txs(template, TX_COUNT)
+
+        self.assertEqual(10, len(validated))
+        self.assertEqual(other.addresses(5), workload.addresses(5))
+
+
+class TestWorkloadHello(HelloTestBase):
+
+    def test_send_workload(self):
+        workload = self._make_workload(0)
+        template = workload.call_template(self.score_owner, self.score_address, 'appendArray')
+        tx_list = workload.make_txs(template, TX_COUNT, params=lambda index: {"data": str(index)})
+        workload.validate(self.icon_service_engine, tx_list, sample_size=10)
+
+        self.send_txs(tx_list, block_size=10)
+
+        response = self.query(self.score_address, 'getArrayRange', {"limit": hex(TX_COUNT)})
+        self.assertEqual([str(index) for index in range(TX_COUNT)], response)
@@ -0,0 +1,112 @@
+import copy
+import random
+
+from typing import Callable, List, Optional
+
+from iconservice.base.address import Address, AddressPrefix
+
+# 2020-01-01 00:00:00 UTC. Transactions are not checked against the block time, so any fixed value works
+DEFAULT_START_TIMESTAMP_US = 1_577_836_800_000_000
+DEFAULT_SIGNATURE = "VAia7YZ2Ji6igKWzjR2YsGa2m53nKPrfK7uXYW78QLE+ATehAVZPC40szvAiA6NEU5gCYB4c4qaQzqDh2ugcHgA="
+
+
+class WorkloadGenerator:
+    """Class for generating addresses, hashes and transaction requests in bulk from a seed.
+
+    The same seed and the same sequence of calls always produce the same workload.
+    Transactions are copied from templates, so a template is built once however many transactions are made.
+    """
+
+    def __init__(self,
+                 seed: int,
+                 version: int = 3,
+                 step_limit: int = 1 * 10 ** 9,
+                 signature: str = DEFAULT_SIGNATURE,
+                 start_timestamp_us: int = DEFAULT_START_TIMESTAMP_US):
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._version = version
+        self._step_limit = step_limit
+        self._signature = signature
+        self._timestamp_us = start_timestamp_us
+
+    def hash_256(self) -> bytes:
+        return self._random.getrandbits(256).to_bytes(32, 'big')
+
+    def hashes(self, count: int) -> List[bytes]:
+        return [self.hash_256() for _ in range(count)]
+
+    def address(self, prefix: AddressPrefix = AddressPrefix.EOA) -> 'Address':
+        return Address(prefix, self._random.getrandbits(160).to_bytes(20, 'big'))
+
+    def addresses(self, count: int, prefix: AddressPrefix = AddressPrefix.EOA) -> List['Address']:
+        return [self.address(prefix) for _ in range(count)]
+
+    def transfer_template(self, addr_from: Optional['Address'], addr_to: 'Address', value: int) -> dict:
+        return self._template(addr_from, addr_to, value)
+
+    def message_template(self, addr_from: Optional['Address'], addr_to: 'Address', data: str) -> dict:
+        return self._template(addr_from, addr_to, 0, dataType='message', data=data)
+
+    def call_template(self,
+                      addr_from: Optional['Address'],
+                      addr_to: 'Address',
+                      method: str,
+                      params: dict = None,
+                      value: int = 0) -> dict:
+        return self._template(addr_from, addr_to, value,
+                              dataType='call', data={'method': method, 'params': {} if params is None else params})
+
+    def make_txs(self,
+                 template: dict,
+                 count: int,
+                 senders: List['Address'] = None,
+                 params: Callable[[int], dict] = None) -> List[dict]:
+        """Returns count icx_sendTransaction requests made from template
+
+        Every transaction gets the next timestamp and a new txHash.
+
+        :param template: made by transfer_template(), message_template() or call_template()
+        :param count: the number of transactions
+        :param senders: 'from' of the transactions in turn. 'from' of template if None
+        :param params: returns the call params of the index-th transaction. params of template if None
+        """
+        tx_list = []
+        for index in range(count):
+            request_params = dict(template)
+            if senders:
+                request_params['from'] = senders[index % len(senders)]
+            if params is not None:
+                request_params['data'] = {'method': template['data']['method'], 'params': params(index)}
+            elif isinstance(template.get('data'), dict):
+                # Call data is nested, so every transaction gets its own copy
+                request_params['data'] = copy.deepcopy(template['data'])
+            request_params['timestamp'] = self._timestamp_us
+            request_params['txHash'] = self.hash_256()
+            self._timestamp_us += 1
+            tx_list.append({'method': 'icx_sendTransaction', 'params': request_params})
+        return tx_list
+
+    def validate(self, engine: 'IconServiceEngine', tx_list: List[dict], sample_size: int = None):
+        """Pre-validates tx_list or, if sample_size is given, a seeded sample of it
+
+        Transactions made from one template differ only in the varied fields,
+        so checking a sample is usually enough for large workloads.
+        The sample is drawn from its own generator, so validating does not change the rest of the workload.
+        """
+        if sample_size is not None and sample_size < len(tx_list):
+            tx_list = random.Random(self._seed).sample(tx_list, sample_size)
+        for tx in tx_list:
+            engine.validate_transaction(tx)
+
+    def _template(self, addr_from: Optional['Address'], addr_to: 'Address', value: int, **fields) -> dict:
+        return {
+            "version": self._version,
+            "from": addr_from,
+            "to": addr_to,
+            "value": value,
+            "stepLimit": self._step_limit,
+            "nonce": 0,
+            "signature": self._signature,
+            **fields
+        }